@@ -0,0 +1,103 @@
+# Packing of many 1-D bin packing instances at once, using NumPy arrays
+# instead of one Solution object per instance.
+from binp import is_integer_instance
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class BatchPacker(object):
+    """Packs a list of Instance objects together. The items of every instance
+    are kept in one matrix (instances x items) and the boxes in a load matrix
+    (instances x boxes), so each step places one item of every instance with
+    vectorized fit checks. If every instance is integer, the matrices are int64
+    and the fit checks are exact. It gives the same boxes as the per-instance
+    constructors."""
+
+    ALGORITHMS = {"FirstFitConstructor": ("first_fit", False),
+                  "DescendingFirstFitConstructor": ("first_fit", True),
+                  "BestFitConstructor": ("best_fit", False),
+                  "DescendingBestFitConstructor": ("best_fit", True)}
+
+    def __init__(self, instances):
+        if numpy is None:
+            raise ImportError("BatchPacker requires NumPy.")
+        if len(instances) == 0:
+            raise ValueError("At least one instance should be given.")
+
+        self.instances = instances
+        self.dtype = numpy.int64 if all(is_integer_instance(inst) for inst in instances) else numpy.float64
+        self.sizes = numpy.array([len(inst.objects) for inst in instances], dtype=numpy.intp)
+        self.capacities = numpy.array([inst.bin_capacity for inst in instances], dtype=self.dtype)
+        self.objects = numpy.zeros((len(instances), self.sizes.max()), dtype=self.dtype)
+        for row, inst in enumerate(instances):
+            self.objects[row, :len(inst.objects)] = inst.objects
+
+        if (self.objects > self.capacities[:, None]).any():
+            raise ValueError("Impossible to add object to box.")
+
+    def pack(self, algorithm):
+        """Packs the instances with the algorithm named after its constructor
+        class. Returns the box of each object and the number of boxes used."""
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError("Algorithm not available in batch mode: " + algorithm)
+        method, descending = self.ALGORITHMS[algorithm]
+        return getattr(self, method)(descending)
+
+    def first_fit(self, descending=False):
+        """Puts each object in the first box that can hold it."""
+        return self._pack(self._first_fit_boxes, descending)
+
+    def best_fit(self, descending=False):
+        """Puts each object in the fullest box that can hold it."""
+        return self._pack(self._best_fit_boxes, descending)
+
+    def _pack(self, choose_boxes, descending):
+        """Places the objects column by column. Returns a matrix with the box of
+        each object, at its position in the instance, and the number of boxes per
+        instance. Objects of the padding get box -1."""
+        order = self._get_order(descending)
+        objects = numpy.take_along_axis(self.objects, order, axis=1) if order is not None else self.objects
+        n_instances, n_objects = objects.shape
+        loads = numpy.zeros((n_instances, n_objects), dtype=self.dtype)
+        assignments = numpy.full((n_instances, n_objects), -1, dtype=numpy.intp)
+        bin_counts = numpy.zeros(n_instances, dtype=numpy.intp)
+
+        for column in range(n_objects):
+            rows = numpy.nonzero(self.sizes > column)[0]
+            weights = objects[rows, column]
+            open_boxes = bin_counts[rows].max() + 1
+            space = self.capacities[rows, None] - loads[rows, :open_boxes]
+            boxes = choose_boxes(space, weights, bin_counts[rows])
+
+            loads[rows, boxes] += weights
+            assignments[rows, column] = boxes
+            bin_counts[rows] = numpy.maximum(bin_counts[rows], boxes + 1)
+
+        if order is not None:
+            numpy.put_along_axis(assignments, order, assignments.copy(), axis=1)
+        return assignments, bin_counts
+
+    def _get_order(self, descending):
+        """Return the positions of the objects of each row in the order that they
+        need to be processed, or None for the order of the instances. Objects with
+        the same weight keep their order and padding zeros stay at the end."""
+        if descending:
+            return numpy.argsort(-self.objects, axis=1, kind="stable")
+        return None
+
+    @staticmethod
+    def _first_fit_boxes(space, weights, bin_counts):
+        """The first column with enough space. Columns past the boxes already
+        used are empty boxes, so this also opens a new box when needed."""
+        return numpy.argmax(space >= weights[:, None], axis=1)
+
+    @staticmethod
+    def _best_fit_boxes(space, weights, bin_counts):
+        """The used box with least space that can hold the weight, or a new box."""
+        columns = numpy.arange(space.shape[1])
+        fits = (space >= weights[:, None]) & (columns < bin_counts[:, None])
+        candidates = numpy.where(fits, space, numpy.inf)
+        boxes = numpy.argmin(candidates, axis=1)
+        return numpy.where(fits.any(axis=1), boxes, bin_counts)
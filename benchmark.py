@@ -0,0 +1,175 @@
+# Benchmark of the constructive algorithms implemented in binp.py over the
+# OR-Library instances and over seeded synthetic instances of growing size.
+# Results are written as JSON, so they can be compared between releases.
+from binp import *
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+
+INSTANCE_PATH = os.path.join(os.curdir, "instances")
+
+INSTANCE_FILES = ["binpack1.txt", "binpack2.txt", "binpack3.txt"
+                  ,"binpack4.txt", "binpack5.txt", "binpack6.txt"
+                  ,"binpack7.txt", "binpack8.txt"]
+
+SYNTHETIC_SIZES = [10**3, 10**4, 10**5, 10**6]
+
+PERCENTILES = [10, 50, 90, 99]
+
+INTEGER_ALGORITHMS = ["BucketBestFitConstructor", "DescendingBucketBestFitConstructor"]
+
+def constructor_algorithms():
+    """Returns the names of every Constructor subclass that can generate solutions,
+    sorted by name."""
+    names = set()
+    pending = list(Constructor.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if hasattr(cls, "_find_box_that_fits"):
+            names.add(cls.__name__)
+    return sorted(names)
+
+def synthetic_instance(n_objects, seed, bin_cap=150, min_weight=20, max_weight=100):
+    """Returns an instance with n_objects integer weights drawn uniformly, like the
+    uniform class of the OR-Library. The same seed always gives the same instance."""
+    rng = random.Random(seed)
+    objects = [rng.randint(min_weight, max_weight) for x in range(n_objects)]
+    return Instance("synthetic_{0}_{1}".format(n_objects, seed), bin_cap, objects, 0)
+
+def percentile(sorted_values, p):
+    """Returns the p-th percentile of a sorted list, interpolating between the
+    closest ranks."""
+    if not sorted_values:
+        raise ValueError("At least one value is needed to compute a percentile.")
+    rank = (len(sorted_values) - 1) * p / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+def benchmark_case(algorithm, instances, repeats=5, warmup=1, budget=None):
+    """Solves all the instances with the algorithm warmup + repeats times, timing
+    each repetition with perf_counter_ns. Returns a dict with the samples, their
+    statistics and the total number of boxes used. Once a run takes more than
+    budget seconds no more runs are made, and that run is kept as a sample even
+    if it was a warmup one; stopped is then true in the result."""
+    if repeats < 1:
+        raise ValueError("At least one repetition is needed.")
+    constructor_class = globals()[algorithm]
+    samples = []
+    stopped = False
+    for run in range(warmup + repeats):
+        boxes = 0
+        start = time.perf_counter_ns()
+        for instance in instances:
+            boxes += len(constructor_class(instance).generate_solution().boxes)
+        elapsed = time.perf_counter_ns() - start
+        if run >= warmup:
+            samples.append(elapsed)
+        if budget is not None and elapsed > budget * 1e9:
+            if run < warmup:
+                samples.append(elapsed)
+            stopped = run < warmup + repeats - 1
+            break
+
+    ordered = sorted(samples)
+    result = {"algorithm": algorithm,
+              "instances": len(instances),
+              "objects": sum(len(instance.objects) for instance in instances),
+              "boxes": boxes,
+              "samples_ns": samples,
+              "min_ns": ordered[0],
+              "max_ns": ordered[-1],
+              "stopped": stopped}
+    for p in PERCENTILES:
+        result["p{0}_ns".format(p)] = int(round(percentile(ordered, p)))
+    result["median_ns"] = result["p50_ns"]
+    return result
+
+def run_benchmark(algorithms, sizes, seed=0, repeats=5, warmup=1, budget=10.0, files=INSTANCE_FILES):
+    """Benchmarks the algorithms over the OR-Library files and over a synthetic
+    instance of each size. A synthetic size stops being repeated once one run
+    exceeds budget seconds, and then the larger sizes are skipped. A larger size
+    is also skipped if the median of the previous one, scaled with the square of
+    the size ratio for the quadratic algorithms, exceeds the budget. Algorithms
+    that cannot solve an instance set, like the integer-only ones on float
+    instances, are skipped."""
+    results = []
+    for instance_file in files:
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_PATH, instance_file))
+        for algorithm in algorithms:
+            result = _run_case(algorithm, instances, repeats, warmup)
+            result["set"] = instance_file
+            results.append(result)
+            _log(result)
+
+    too_slow = set()
+    previous = {}
+    for size in sorted(sizes):
+        instance = synthetic_instance(size, seed)
+        for algorithm in algorithms:
+            if algorithm in previous:
+                last_size, last_median = previous[algorithm]
+                if last_median * (float(size) / last_size) ** 2 > budget * 1e9:
+                    too_slow.add(algorithm)
+            if algorithm in too_slow:
+                results.append({"algorithm": algorithm, "set": instance.instance_name,
+                                "objects": size, "skipped": True})
+                continue
+            result = _run_case(algorithm, [instance], repeats, warmup, budget)
+            result["set"] = instance.instance_name
+            results.append(result)
+            _log(result)
+            if result.get("stopped") or result.get("median_ns", 0) > budget * 1e9:
+                too_slow.add(algorithm)
+            elif "median_ns" in result:
+                previous[algorithm] = (size, result["median_ns"])
+
+    return {"python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeats": repeats,
+            "warmup": warmup,
+            "results": results}
+
+def _run_case(algorithm, instances, repeats, warmup, budget=None):
+    """Calls benchmark_case, returning a skipped result if the algorithm refuses
+    the instances."""
+    if algorithm in INTEGER_ALGORITHMS and not all(is_integer_instance(inst) for inst in instances):
+        return {"algorithm": algorithm, "objects": sum(len(inst.objects) for inst in instances),
+                "skipped": True}
+    return benchmark_case(algorithm, instances, repeats, warmup, budget)
+
+def _log(result):
+    """Prints the progress of the benchmark to stderr."""
+    if result.get("skipped"):
+        return
+    sys.stderr.write("{0}\t{1}\t{2}\t{3:.4f}\n".format(result["set"], result["algorithm"],
+                                                       result["boxes"], result["median_ns"] / 1e9))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the constructive algorithms.")
+    parser.add_argument("-a", "--algorithms", nargs="+", default=None,
+                        help="constructor classes to run (default: all)")
+    parser.add_argument("-s", "--sizes", nargs="*", type=int, default=SYNTHETIC_SIZES,
+                        help="number of objects of the synthetic instances")
+    parser.add_argument("-r", "--repeats", type=int, default=5)
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="seconds per run above which a synthetic size is not repeated "
+                             "and larger sizes are skipped")
+    parser.add_argument("-o", "--output", default=None, help="JSON file (default: stdout)")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.algorithms or constructor_algorithms(), args.sizes, args.seed,
+                           args.repeats, args.warmup, args.budget)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
@@ -0,0 +1,146 @@
+# Binary container for 1-D bin packing instances. Each instance is a fixed-size
+# header followed by its objects as a contiguous float64, int32 or int64 array,
+# and an index at the end of the file holds the offset of every instance, so a
+# single instance can be read from a memory-mapped file without parsing the rest.
+#
+# Layout (little endian, the objects included, whatever the byte order of the host):
+#   file header:     magic (8 bytes), number of instances (u64), index offset (u64)
+#   instance header: name (64 bytes, utf-8, zero padded), capacity (f64),
+#                    number of objects (u64), best known solution (i64),
+#                    type code of the objects (1 byte), padding (7 bytes)
+#   objects:         number of objects x item size of the type code
+#   index:           offset of each instance header (u64)
+from binp import ORLibraryInstanceReader, Instance, is_integer_instance
+import sys
+import mmap
+import array
+import struct
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = b"BINPACK1"
+
+FILE_HEADER = struct.Struct("<8sQQ")
+
+INSTANCE_HEADER = struct.Struct("<64sdQqc7x")
+
+INT32_MIN, INT32_MAX = -2**31, 2**31 - 1
+
+# Little-endian NumPy type of the objects for each type code.
+DTYPES = {'i': '<i4', 'q': '<i8', 'd': '<f8'}
+
+SWAP_BYTES = sys.byteorder != "little"
+
+def write_instances(instances, path):
+    """Writes the instances to a binary file. Integer instances are stored as int32,
+    or int64 if some object does not fit in 32 bits, and the others as float64.
+    Returns the number of instances written."""
+    offsets = array.array('Q')
+    with open(path, 'wb') as output:
+        output.write(FILE_HEADER.pack(MAGIC, 0, 0))
+        for instance in instances:
+            offsets.append(output.tell())
+            _write_instance(output, instance)
+        index_offset = output.tell()
+        offsets.tofile(output)
+        output.seek(0)
+        output.write(FILE_HEADER.pack(MAGIC, len(offsets), index_offset))
+    return len(offsets)
+
+def convert(text_path, binary_path):
+    """Converts an OR-Library text file to the binary format, one instance at a time."""
+    return write_instances(ORLibraryInstanceReader.iter_instances(text_path), binary_path)
+
+def _write_instance(output, instance):
+    """Writes the header and the objects of an instance at the current position."""
+    name = instance.instance_name.encode("utf-8")
+    if len(name) > 64:
+        raise ValueError("Instance names are limited to 64 bytes.")
+    typecode = 'd'
+    if is_integer_instance(instance):
+        in_int32 = all(INT32_MIN <= obj <= INT32_MAX for obj in instance.objects)
+        typecode = 'i' if in_int32 else 'q'
+    objects = array.array(typecode, instance.objects)
+    output.write(INSTANCE_HEADER.pack(name, float(instance.bin_capacity), len(objects),
+                                      instance.best_known_sol, typecode.encode()))
+    if SWAP_BYTES:
+        objects.byteswap()
+    objects.tofile(output)
+    padding = -len(objects) * objects.itemsize % 8
+    output.write(b"\0" * padding)
+
+
+class BinaryInstanceFile(object):
+    """Read access to a binary instance file through a memory map. The objects of
+    each Instance are a zero-copy view of the file: a NumPy array if NumPy is
+    installed, or a memoryview otherwise. Only the pages of the instances used
+    are read from disk. The views must be released before calling close().
+    Without NumPy on a big-endian host the objects are a byte-swapped array
+    copy instead of a view."""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, index_offset = FILE_HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Not a binary instance file.")
+        self.offsets = struct.unpack_from("<{0}Q".format(self.count), self.map, index_offset)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, idx):
+        """Returns the instance at position idx of the file."""
+        offset = self.offsets[idx]
+        name, bin_cap, n_objects, best_sol, typecode = INSTANCE_HEADER.unpack_from(self.map, offset)
+        typecode = typecode.decode()
+        start = offset + INSTANCE_HEADER.size
+        if numpy is not None:
+            objects = numpy.frombuffer(self.map, dtype=DTYPES[typecode], count=n_objects, offset=start)
+        else:
+            end = start + n_objects * array.array(typecode).itemsize
+            objects = memoryview(self.map)[start:end].cast(typecode)
+            if SWAP_BYTES:
+                swapped = array.array(typecode, objects)
+                objects.release()
+                swapped.byteswap()
+                objects = swapped
+        if typecode != 'd':
+            bin_cap = int(bin_cap)
+        return Instance(name.rstrip(b"\0").decode("utf-8"), bin_cap, objects, best_sol)
+
+    def __iter__(self):
+        for idx in range(self.count):
+            yield self[idx]
+
+    def names(self):
+        """Returns the names of the instances, reading only their headers."""
+        return [INSTANCE_HEADER.unpack_from(self.map, offset)[0].rstrip(b"\0").decode("utf-8")
+                for offset in self.offsets]
+
+    def get(self, instance_name):
+        """Returns the instance with the given name, or None."""
+        for idx, name in enumerate(self.names()):
+            if name == instance_name:
+                return self[idx]
+        return None
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python binary_instances.py INPUT.txt OUTPUT.bin")
+    print("{0} instances written".format(convert(sys.argv[1], sys.argv[2])))
@@ -1,3 +1,13 @@
+import array
+import bisect
+import heapq
+import itertools
+import numbers
+import operator
+import time
+from collections.abc import Mapping
+
+
 class ORLibraryInstanceReader(object):
     """Class that knows how to load the ORLibrary instances for the 1-D bin
     packing instances"""
@@ -5,31 +15,47 @@ class ORLibraryInstanceReader(object):
     @classmethod
     def get_instances(cls, file):
         """Returns a list of Instance objects with the instances found in file param"""
-        file_data = cls._read_file(file)
-        number_of_instances = cls._get_number_of_instances(file_data)
-        
-        instances = []
-        idx = 1
-        for x in range(0, number_of_instances):
-            instance_name = file_data[idx].strip()
-            bin_cap, n_itens, best_sol = cls._get_instance_definition(file_data[idx+1])
-            
-            objects = []
-            for line in file_data[idx+2:idx+2+n_itens]:
-                objects.append(float(line))
-            
-            inst = Instance(instance_name, bin_cap, objects, best_sol)
-            instances.append(inst)
-            idx = idx+n_itens+2
-        
-        return instances
+        return list(cls.iter_instances(file))
+
+    @classmethod
+    def iter_instances(cls, file, compact=False):
+        """Yields the instances found in file param one at a time, reading the file
+        incrementally. If the capacity and every object of an instance are integers,
+        they are kept as ints, otherwise as floats. If compact is true, the objects
+        are stored in an array('q') or array('d') instead of a list."""
+        with open(file, 'r') as input_file:
+            number_of_instances = cls._get_number_of_instances([input_file.readline()])
+
+            for x in range(0, number_of_instances):
+                instance_name = input_file.readline().strip()
+                bin_cap, n_itens, best_sol = cls._get_instance_definition(input_file.readline())
+
+                integer = isinstance(bin_cap, int)
+                objects = cls._new_objects(integer, compact)
+                for line in itertools.islice(input_file, n_itens):
+                    if integer:
+                        try:
+                            objects.append(int(line))
+                            continue
+                        except ValueError:
+                            integer = False
+                            objects = cls._new_objects(integer, compact, objects)
+                    objects.append(float(line))
+
+                if not integer:
+                    bin_cap = float(bin_cap)
+                yield Instance(instance_name, bin_cap, objects, best_sol)
 
     @classmethod
     def _get_instance_definition(cls, line):
         """It returns the bin capacity, number of itens in instance and the number of bins used 
         in the best known solution"""
         bin_capacity, number_of_itens, bins_in_best_sol = line.split()
-        return float(bin_capacity), int(number_of_itens), int(bins_in_best_sol)
+        try:
+            bin_capacity = int(bin_capacity)
+        except ValueError:
+            bin_capacity = float(bin_capacity)
+        return bin_capacity, int(number_of_itens), int(bins_in_best_sol)
 
     @classmethod
     def _get_number_of_instances(cls, data):
@@ -37,16 +63,18 @@ class ORLibraryInstanceReader(object):
         return int(data[0])
 
     @classmethod
-    def _read_file(cls, file):
-        """Reads a file, returning a list with its contents"""
-        input_file = open(file, 'r')
-        data = list(input_file)
-        input_file.close()
-        return data
+    def _new_objects(cls, integer, compact, objects=()):
+        """Returns a new container for the objects of an instance, with a copy of
+        the given objects converted to int or float."""
+        number = int if integer else float
+        if compact:
+            return array.array('q' if integer else 'd', [number(obj) for obj in objects])
+        return [number(obj) for obj in objects]
 
 
 class Instance(object):
     """Class that represents an 1-D bin packing problem instance"""
+    __slots__ = ('instance_name', 'bin_capacity', 'objects', 'best_known_sol')
     
     def __init__(self, instance_name, bin_cap, objects, best_sol):
         self.instance_name = instance_name
@@ -55,27 +83,125 @@ class Instance(object):
         self.best_known_sol = best_sol
 
 
+def is_integer_instance(instance):
+    """True if the capacity and every object of the instance are integers."""
+    return (isinstance(instance.bin_capacity, numbers.Integral) and
+            all(isinstance(obj, numbers.Integral) for obj in instance.objects))
+
+
+def descending_order(objects):
+    """Returns the positions of the objects sorted by decreasing weight, the
+    objects with the same weight in their original order."""
+    return sorted(range(len(objects)), key=objects.__getitem__, reverse=True)
+
+
 class Constructor(object):
-    """Base class of constructive algorithms"""
+    """Base class of constructive algorithms. If compact is true, the solutions
+    are generated as CompactSolution objects. If profile, a Profile, is given,
+    counters and timings of each generate_solution() call are added to it."""
     
-    def __init__(self, instance):
+    def __init__(self, instance, compact=False, profile=None):
         self.instance = instance
+        self.compact = compact
+        self.profile = profile
 
     def generate_solution(self):
         """Generates a new solution for a given instance"""
-        solution = Solution(self.instance.bin_capacity, len(self.instance.objects))
-        for obj, weight in enumerate(self._get_objects_in_order(self.instance.objects)):
+        solution = self._create_solution()
+        if self.profile is not None:
+            return self._generate_profiled_solution(solution)
+
+        objects = self.instance.objects
+        self._prepare_index(solution)
+        for obj in self._get_order(objects):
+            weight = objects[obj]
             box_number = self._find_box_that_fits(weight, solution)
             isAdded = solution.add_object(obj, weight, box_number)
             if not isAdded:
                 raise ValueError("Impossible to add object to box.")
-            
+            self._update_index(box_number, solution)
+
+        self._finish_index(solution)
+        return solution
+
+    def _create_solution(self):
+        """Returns an empty solution of the class selected by compact and profile."""
+        bin_cap, size = self.instance.bin_capacity, len(self.instance.objects)
+        if self.compact:
+            solution_class = ProfiledCompactSolution if self.profile is not None else CompactSolution
+            solution = solution_class(bin_cap, size, is_integer_instance(self.instance))
+        else:
+            solution_class = ProfiledSolution if self.profile is not None else Solution
+            solution = solution_class(bin_cap, size)
+        if self.profile is not None:
+            solution.profile = self.profile
+        return solution
+
+    def _generate_profiled_solution(self, solution):
+        """Same loop as generate_solution, timing each phase. Kept apart so the
+        loop without profile pays nothing for it."""
+        profile = self.profile
+        clock = time.perf_counter
+        profile.solutions += 1
+
+        start = clock()
+        objects = self.instance.objects
+        order = self._get_order(objects)
+        profile.add_time("sort", clock() - start)
+        start = clock()
+        self._prepare_index(solution)
+        profile.add_time("index", clock() - start)
+
+        search_time = add_time = index_time = 0.0
+        for obj in order:
+            weight = objects[obj]
+            queries = profile.space_queries
+            steps = self._index_steps()
+            start = clock()
+            box_number = self._find_box_that_fits(weight, solution)
+            searched = clock()
+            profile.boxes_scanned += profile.space_queries - queries + self._index_steps() - steps
+            isAdded = solution.add_object(obj, weight, box_number)
+            added = clock()
+            if not isAdded:
+                raise ValueError("Impossible to add object to box.")
+            self._update_index(box_number, solution)
+            search_time += searched - start
+            add_time += added - searched
+            index_time += clock() - added
+            profile.objects += 1
+
+        start = clock()
+        self._finish_index(solution)
+        index_time += clock() - start
+        profile.add_time("search", search_time)
+        profile.add_time("add", add_time)
+        profile.add_time("index", index_time)
         return solution
 
-    def _get_objects_in_order(self, objects):
-        """Return the objects in the order that they need to be processed by
-        the algorithm."""
-        return objects
+    def _get_order(self, objects):
+        """Return the positions of the objects in the order that they need to be
+        processed by the algorithm. The solution records these positions, so its
+        objects are the ones of the instance whatever the order."""
+        return range(len(objects))
+
+    def _prepare_index(self, solution):
+        """Called before the first object is processed. Algorithms that keep an
+        index of the boxes should build it here. Does nothing by default."""
+        pass
+
+    def _update_index(self, box, solution):
+        """Called after an object is added to box. Does nothing by default."""
+        pass
+
+    def _finish_index(self, solution):
+        """Called after the last object is processed. Does nothing by default."""
+        pass
+
+    def _index_steps(self):
+        """Returns the steps taken so far by the searches in the index of the
+        boxes, which the profile counts as boxes scanned. 0 by default."""
+        return 0
 
 
 class FirstFitConstructor(Constructor):
@@ -96,8 +222,39 @@ class DescendingFirstFitConstructor(FirstFitConstructor):
     """Constructor algorithm based on First Fit. It sorts the objects descending
      by its weight prior to processing them."""
     
-    def _get_objects_in_order(self, objects):
-        return sorted(objects, reverse=True)
+    def _get_order(self, objects):
+        return descending_order(objects)
+
+
+class TreeFirstFitConstructor(FirstFitConstructor):
+    """First Fit that keeps the space available in each box in a ResidualTree,
+    finding the first box that can hold an object in O(log n) instead of
+    scanning all the boxes. It produces the same packing as FirstFitConstructor."""
+
+    def _prepare_index(self, solution):
+        self.tree = ResidualTree(len(self.instance.objects), solution.box_size)
+
+    def _find_box_that_fits(self, weight, solution):
+        """Return the first box that have enough space to hold the given weight.
+        If none, it opens a new box."""
+        box_number = self.tree.find_first(weight)
+        if box_number is None or box_number >= len(solution.boxes):
+            return solution.create_box()
+        return box_number
+
+    def _update_index(self, box, solution):
+        self.tree.update(box, solution.amount_space_available_box(box))
+
+    def _index_steps(self):
+        return self.tree.steps
+
+
+class DescendingTreeFirstFitConstructor(TreeFirstFitConstructor):
+    """Constructor algorithm based on Tree First Fit. It sorts the objects descending
+     by its weight prior to processing them."""
+
+    def _get_order(self, objects):
+        return descending_order(objects)
 
 
 class BestFitConstructor(Constructor):
@@ -125,12 +282,345 @@ class DescendingBestFitConstructor(BestFitConstructor):
     """Constructor algorithm based on Best Fit. It sorts the objects descending
      by its weight prior to processing them."""
     
-    def _get_objects_in_order(self, objects):
-        return sorted(objects, reverse=True)
+    def _get_order(self, objects):
+        return descending_order(objects)
+
+
+class SortedBestFitConstructor(BestFitConstructor):
+    """Best Fit that keeps the open boxes in a ResidualIndex ordered by space
+    available, finding the fullest box that can hold an object in O(log n).
+    It produces the same packing as BestFitConstructor."""
+
+    def _prepare_index(self, solution):
+        self.index = ResidualIndex()
+
+    def _find_box_that_fits(self, weight, solution):
+        """Return the fullest box that have enough space to hold the given weight.
+        If none, it opens a new box."""
+        box_number = self.index.find_best(weight)
+        if box_number is None:
+            return solution.create_box()
+        return box_number
+
+    def _update_index(self, box, solution):
+        self.index.update(box, solution.amount_space_available_box(box))
+
+    def _index_steps(self):
+        return self.index.steps
+
+
+class DescendingSortedBestFitConstructor(SortedBestFitConstructor):
+    """Constructor algorithm based on Sorted Best Fit. It sorts the objects descending
+     by its weight prior to processing them."""
+
+    def _get_order(self, objects):
+        return descending_order(objects)
+
+
+class BucketBestFitConstructor(SortedBestFitConstructor):
+    """Best Fit for integer instances that keeps the open boxes in ResidualBuckets,
+    one bucket per possible space available, so each search is a bit scan that
+    does not depend on how many boxes are open. It produces the same packing as
+    BestFitConstructor."""
+
+    def _prepare_index(self, solution):
+        if not is_integer_instance(self.instance):
+            raise ValueError("BucketBestFitConstructor needs an integer instance.")
+        self.index = ResidualBuckets()
+
+
+class DescendingBucketBestFitConstructor(BucketBestFitConstructor):
+    """Constructor algorithm based on Bucket Best Fit. It sorts the objects descending
+     by its weight prior to processing them."""
+
+    def _get_order(self, objects):
+        return descending_order(objects)
+
+
+class BoundedSpaceConstructor(Constructor):
+    """Base class of the constructors that keep at most k boxes open and process
+    the objects in a single pass, in the order of the instance. A box that is
+    closed never gets another object, and it is passed to on_close(box, objects,
+    load) when that happens. generate_solution() keeps every box in the Solution;
+    stream_boxes() keeps only the open ones, so its memory is O(k)."""
+
+    def __init__(self, instance, k=1, compact=False, profile=None, on_close=None):
+        Constructor.__init__(self, instance, compact, profile)
+        if k < 1:
+            raise ValueError("The number of open boxes should be greater than zero.")
+        self.k = k
+        self.on_close = on_close
+        self._closed = None
+        self._open_objects = None
+        self._processed = 0
+
+    def stream_boxes(self):
+        """Packs the objects, yielding (box, objects, load) for each box as soon
+        as it is closed. The boxes still open at the end are yielded last, in
+        box number order."""
+        solution = OpenBoxes(self.instance.bin_capacity)
+        objects = self.instance.objects
+        self._closed = []
+        try:
+            self._prepare_index(solution)
+            for obj in self._get_order(objects):
+                box_number = self._find_box_that_fits(objects[obj], solution)
+                if not solution.add_object(obj, objects[obj], box_number):
+                    raise ValueError("Impossible to add object to box.")
+                if self._closed:
+                    for closed in self._closed:
+                        yield closed
+                    del self._closed[:]
+            self._finish_index(solution)
+            for closed in self._closed:
+                yield closed
+        finally:
+            self._closed = None
+
+    def _prepare_index(self, solution):
+        """Subclasses reset their open boxes here after calling this. When a
+        Solution is generated with on_close, the objects of the open boxes are
+        kept apart, since listing the objects of a box of a CompactSolution
+        goes over every object."""
+        self._processed = 0
+        if self.on_close is not None and self._closed is None:
+            self._open_objects = {}
+        else:
+            self._open_objects = None
+
+    def _update_index(self, box, solution):
+        """The objects are processed in the order of the instance, so the one
+        just added is the next position."""
+        if self._open_objects is not None:
+            self._open_objects.setdefault(box, []).append(self._processed)
+        self._processed += 1
+
+    def _close_box(self, box, solution):
+        """Closes box, passing it to on_close. While streaming, the box is also
+        queued to be yielded and removed from the open boxes. Nothing is done
+        otherwise."""
+        if self.on_close is None and self._closed is None:
+            return
+        if self._open_objects is not None:
+            objects = self._open_objects.pop(box, [])
+        else:
+            objects = solution.boxes[box]
+        load = solution.box_size - solution.amount_space_available_box(box)
+        if self.on_close is not None:
+            self.on_close(box, objects, load)
+        if self._closed is not None:
+            self._closed.append((box, objects, load))
+            solution.remove_box(box)
+
+    def _finish_index(self, solution):
+        for box in sorted(self.open_boxes):
+            self._close_box(box, solution)
+
+
+class NextKFitConstructor(BoundedSpaceConstructor):
+    """Bounded-space constructor that keeps the k boxes opened last. Each object
+    goes in the first of them, the oldest first, that can hold it. If none can,
+    the oldest box is closed when k are open, and a new box is opened. Each
+    object takes O(k) time."""
+
+    def __init__(self, instance, k=2, compact=False, profile=None, on_close=None):
+        BoundedSpaceConstructor.__init__(self, instance, k, compact, profile, on_close)
+
+    def _prepare_index(self, solution):
+        BoundedSpaceConstructor._prepare_index(self, solution)
+        self.open_boxes = []
+
+    def _find_box_that_fits(self, weight, solution):
+        """Return the first open box that have enough space to hold the given
+        weight. If none, it opens a new box."""
+        for box_number in self.open_boxes:
+            if solution.has_space_box(box_number, weight):
+                return box_number
+        if len(self.open_boxes) == self.k:
+            self._close_box(self.open_boxes.pop(0), solution)
+        box_number = solution.create_box()
+        self.open_boxes.append(box_number)
+        return box_number
+
+
+class NextFitConstructor(NextKFitConstructor):
+    """Constructor algorithm that keeps a single box open: each object goes in it
+    if it fits, and otherwise the box is closed and a new one is opened."""
+
+    def __init__(self, instance, compact=False, profile=None, on_close=None):
+        NextKFitConstructor.__init__(self, instance, 1, compact, profile, on_close)
+
+
+class HarmonicConstructor(BoundedSpaceConstructor):
+    """Harmonic-k of Lee and Lee. An object of weight in (C/(j+1), C/j] belongs to
+    class j for j < k, and the smaller ones to class k. Each class has one open
+    box, which only gets objects of its class, so a box of class j < k is
+    closed with j objects, and class k is packed with Next Fit."""
+
+    def __init__(self, instance, k=5, compact=False, profile=None, on_close=None):
+        BoundedSpaceConstructor.__init__(self, instance, k, compact, profile, on_close)
+
+    def _prepare_index(self, solution):
+        BoundedSpaceConstructor._prepare_index(self, solution)
+        self.open_boxes = {}
+
+    def _find_box_that_fits(self, weight, solution):
+        """Return the open box of the class of the weight if it can hold it.
+        If not, that box is closed and a new one is opened for the class."""
+        size_class = min(self.k, int(solution.box_size // weight))
+        box_number = self.open_boxes.get(size_class)
+        if box_number is not None:
+            if solution.has_space_box(box_number, weight):
+                return box_number
+            self._close_box(box_number, solution)
+        box_number = solution.create_box()
+        self.open_boxes[size_class] = box_number
+        return box_number
+
+    def _finish_index(self, solution):
+        for box in sorted(self.open_boxes.values()):
+            self._close_box(box, solution)
+
+
+class ResidualTree(object):
+    """Tournament tree over the space available in the boxes. Each internal node
+    holds the maximum of its children, so the leftmost box with enough space can
+    be found descending from the root. Boxes not opened yet are full capacity.
+    steps counts the nodes visited by the searches."""
+
+    def __init__(self, size, box_size):
+        self.box_size = box_size
+        self.steps = 0
+        self.leaves = 1
+        while self.leaves < size:
+            self.leaves *= 2
+        self.nodes = [box_size] * (2 * self.leaves)
+
+    def grow(self):
+        """Doubles the number of boxes in the tree. The new boxes are not opened."""
+        old_nodes = self.nodes
+        old_leaves = self.leaves
+        self.leaves *= 2
+        self.nodes = [self.box_size] * (2 * self.leaves)
+        self.nodes[self.leaves:self.leaves + old_leaves] = old_nodes[old_leaves:]
+        for node in range(self.leaves - 1, 0, -1):
+            self.nodes[node] = max(self.nodes[2 * node], self.nodes[2 * node + 1])
+
+    def find_first(self, weight):
+        """Returns the leftmost box that can hold weight, or None."""
+        nodes = self.nodes
+        if nodes[1] < weight:
+            self.steps += 1
+            return None
+        self.steps += self.leaves.bit_length()
+        node = 1
+        while node < self.leaves:
+            node *= 2
+            if nodes[node] < weight:
+                node += 1
+        return node - self.leaves
+
+    def update(self, box, space_available):
+        """Sets the space available in box, updating its ancestors."""
+        nodes = self.nodes
+        node = box + self.leaves
+        nodes[node] = space_available
+        node //= 2
+        while node >= 1:
+            best = max(nodes[2 * node], nodes[2 * node + 1])
+            if nodes[node] == best:
+                break
+            nodes[node] = best
+            node //= 2
+
+
+class ResidualIndex(object):
+    """Sorted list of (space available, box number) pairs maintained with bisect,
+    so the fullest box that can hold a weight is found in O(log n). steps
+    counts the comparisons made by the searches."""
+
+    def __init__(self):
+        self.entries = []
+        self.space = {}
+        self.steps = 0
+
+    def find_best(self, weight):
+        """Returns the box with the least space available that can still hold
+        weight, the lowest box number among ties, or None."""
+        self.steps += len(self.entries).bit_length()
+        position = bisect.bisect_left(self.entries, (weight, -1))
+        if position == len(self.entries):
+            return None
+        return self.entries[position][1]
+
+    def update(self, box, space_available):
+        """Sets the space available in box, adding it to the index if needed."""
+        if box in self.space:
+            self.remove(box)
+        self.space[box] = space_available
+        bisect.insort(self.entries, (space_available, box))
+
+    def remove(self, box):
+        """Removes box from the index."""
+        old_entry = (self.space.pop(box), box)
+        del self.entries[bisect.bisect_left(self.entries, old_entry)]
+
+
+class ResidualBuckets(object):
+    """Index of the boxes by integer space available. Each possible value has a
+    bucket with its boxes in a heap, and a bitset tells which buckets are not
+    empty, so the fullest box that can hold a weight is found with a bit scan
+    of O(C/64) words. Boxes in a bucket that no longer have its space are
+    dropped when they reach the top of the heap. Weights and spaces are turned
+    into Python ints, since shifts of fixed-size integers such as NumPy's
+    would wrap around. steps counts the words of the bitset and the heap
+    entries visited by the searches."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.counts = {}
+        self.space = {}
+        self.bits = 0
+        self.steps = 0
+
+    def find_best(self, weight):
+        """Returns the box with the least space available that can still hold
+        weight, the lowest box number among ties, or None."""
+        weight = operator.index(weight)
+        candidates = self.bits >> weight
+        self.steps += candidates.bit_length() // 64 + 1
+        if candidates == 0:
+            return None
+        space_available = weight + (candidates & -candidates).bit_length() - 1
+        bucket = self.buckets[space_available]
+        while self.space.get(bucket[0]) != space_available:
+            heapq.heappop(bucket)
+            self.steps += 1
+        return bucket[0]
+
+    def update(self, box, space_available):
+        """Sets the space available in box, adding it to the index if needed."""
+        space_available = operator.index(space_available)
+        if box in self.space:
+            self.remove(box)
+        self.space[box] = space_available
+        heapq.heappush(self.buckets.setdefault(space_available, []), box)
+        self.counts[space_available] = self.counts.get(space_available, 0) + 1
+        self.bits |= 1 << space_available
+
+    def remove(self, box):
+        """Removes box from the index."""
+        space_available = self.space.pop(box)
+        self.counts[space_available] -= 1
+        if self.counts[space_available] == 0:
+            del self.counts[space_available]
+            del self.buckets[space_available]
+            self.bits &= ~(1 << space_available)
 
 
 class Solution(object):
     """A solution for the bin packing problem."""
+    __slots__ = ('weights', 'box_size', 'boxes', 'loads')
     
     def __init__(self, box_size, size=1):
         if size <= 0:
@@ -139,6 +629,7 @@ class Solution(object):
         self.weights = [0] * size
         self.box_size = box_size
         self.boxes = {}
+        self.loads = {}
 
     def add_object(self, obj, weight, box):
         """Adds an object obj with a weight in a given box, if possible.
@@ -151,6 +642,7 @@ class Solution(object):
                 
             self.boxes[box].append(obj)
             self.weights[obj] = weight
+            self.loads[box] = self.loads.get(box, 0) + weight
             return True
         return False
     
@@ -158,6 +650,7 @@ class Solution(object):
         """Create a new box, returning its box number"""
         next_box_number = len(self.boxes)
         self.boxes[next_box_number] = []
+        self.loads[next_box_number] = 0
         return next_box_number
 
     def has_space_box(self, box, weight):
@@ -168,17 +661,192 @@ class Solution(object):
         return False
     
     def amount_space_available_box(self, box):
-        """Returns the amount of space available in a given box."""
-        used_weight = 0
-        
-        if box in self.boxes:
-            for obj in self.boxes[box]:
-                used_weight = used_weight + self.weights[obj]
-        
-        free_weight = self.box_size - used_weight
-        return free_weight
+        """Returns the amount of space available in a given box. The load of
+        each box is kept up to date by add_object, so this is O(1)."""
+        return self.box_size - self.loads.get(box, 0)
+
+    def empty_copy(self):
+        """Returns an empty solution of the same class, box size and size."""
+        return type(self)(self.box_size, len(self.weights))
 
     def _validate(self, obj, weight, box):
         """Validate the object, weight and box parameters"""
         if obj < 0 or weight <=0 or box < 0:
             raise ValueError("Invalid data passed as argument.")
+
+
+class OpenBoxes(Solution):
+    """The open boxes of a BoundedSpaceConstructor while it streams its boxes.
+    Boxes are numbered as in a Solution, but the weights of the objects are not
+    kept and remove_box() forgets a closed box, so the memory used depends only
+    on the boxes still open."""
+    __slots__ = ('next_box',)
+
+    def __init__(self, box_size):
+        self.weights = None
+        self.box_size = box_size
+        self.boxes = {}
+        self.loads = {}
+        self.next_box = 0
+
+    def add_object(self, obj, weight, box):
+        """Adds an object obj with a weight in a given open box, if possible.
+        Returns true if added, false otherwise."""
+        self._validate(obj, weight, box)
+        if box in self.boxes and self.has_space_box(box, weight):
+            self.boxes[box].append(obj)
+            self.loads[box] = self.loads[box] + weight
+            return True
+        return False
+
+    def create_box(self):
+        """Create a new box, returning its box number"""
+        box = self.next_box
+        self.next_box += 1
+        self.boxes[box] = []
+        self.loads[box] = 0
+        return box
+
+    def remove_box(self, box):
+        """Forgets a closed box."""
+        del self.boxes[box]
+        del self.loads[box]
+
+
+class Profile(object):
+    """Counters and timings, in seconds, collected by the constructors that
+    receive it. boxes_scanned counts the work of searching for a box: the space
+    queries of the constructors that scan the boxes, and the steps taken in the
+    index by the ones that keep one (tree nodes, bisect comparisons or bitset
+    words). space_queries counts all the space queries and boxes_created the
+    boxes opened."""
+
+    COUNTERS = ('solutions', 'objects', 'boxes_scanned', 'space_queries', 'boxes_created')
+
+    def __init__(self):
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.timings = {}
+
+    def add_time(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def to_dict(self):
+        """Returns the counters and timings in a dict that can be dumped as JSON."""
+        result = dict((name, getattr(self, name)) for name in self.COUNTERS)
+        result["timings"] = dict(self.timings)
+        return result
+
+
+class ProfiledSolutionMixin(object):
+    """Counts the space queries and the boxes created by a solution in its
+    profile attribute. It starts with a Profile of its own, so a profiled
+    solution can be built like any other, e.g. by the local search."""
+    __slots__ = ()
+
+    def __init__(self, *args):
+        super(ProfiledSolutionMixin, self).__init__(*args)
+        self.profile = Profile()
+
+    def create_box(self):
+        self.profile.boxes_created += 1
+        return super(ProfiledSolutionMixin, self).create_box()
+
+    def amount_space_available_box(self, box):
+        self.profile.space_queries += 1
+        return super(ProfiledSolutionMixin, self).amount_space_available_box(box)
+
+
+class ProfiledSolution(ProfiledSolutionMixin, Solution):
+    """Solution that counts its operations in a Profile."""
+    __slots__ = ('profile',)
+
+
+class CompactSolution(Solution):
+    """A solution for the bin packing problem stored in flat arrays: the box of
+    each object, the weight of each object and the load of each box. The boxes
+    attribute is a read-only CompactBoxes view with the same interface as the
+    boxes dict of Solution. If integer is true, weights and loads are stored as
+    64-bit integers and the fit tests are exact."""
+    __slots__ = ('assignment', '_groups')
+
+    def __init__(self, box_size, size=1, integer=False):
+        if size <= 0:
+            raise ValueError("The solution size should be greater than zero.")
+
+        typecode = 'q' if integer else 'd'
+        self.assignment = array.array('i', [-1]) * size
+        self.weights = array.array(typecode, [0]) * size
+        self.box_size = int(box_size) if integer else box_size
+        self.loads = array.array(typecode)
+        self.boxes = CompactBoxes(self)
+        self._groups = None
+
+    def add_object(self, obj, weight, box):
+        """Adds an object obj with a weight in a given box, if possible.
+        Returns true if added, false otherwise."""
+        self._validate(obj, weight, box)
+
+        if box < len(self.loads) and self.has_space_box(box, weight):
+            self.assignment[obj] = box
+            self.weights[obj] = weight
+            self.loads[box] += weight
+            self._groups = None
+            return True
+        return False
+
+    def empty_copy(self):
+        """Returns an empty solution of the same class, box size, size and
+        integer mode."""
+        return type(self)(self.box_size, len(self.weights), self.weights.typecode == 'q')
+
+    def create_box(self):
+        """Create a new box, returning its box number"""
+        self.loads.append(0)
+        self._groups = None
+        return len(self.loads) - 1
+
+    def amount_space_available_box(self, box):
+        """Returns the amount of space available in a given box."""
+        if box < len(self.loads):
+            return self.box_size - self.loads[box]
+        return self.box_size
+
+    def _get_groups(self):
+        """Returns a list with the objects of each box, built in one pass over
+        the assignment array and kept until the solution changes."""
+        if self._groups is None:
+            groups = [[] for box in self.loads]
+            for obj, box in enumerate(self.assignment):
+                if box >= 0:
+                    groups[box].append(obj)
+            self._groups = groups
+        return self._groups
+
+
+class CompactBoxes(Mapping):
+    """Read-only view of the boxes of a CompactSolution, mapping each box number
+    to the list of its objects in ascending order."""
+    __slots__ = ('solution',)
+
+    def __init__(self, solution):
+        self.solution = solution
+
+    def __getitem__(self, box):
+        if not 0 <= box < len(self.solution.loads):
+            raise KeyError(box)
+        return self.solution._get_groups()[box]
+
+    def __iter__(self):
+        return iter(range(len(self.solution.loads)))
+
+    def __len__(self):
+        return len(self.solution.loads)
+
+    def __contains__(self, box):
+        return 0 <= box < len(self.solution.loads)
+
+
+class ProfiledCompactSolution(ProfiledSolutionMixin, CompactSolution):
+    """CompactSolution that counts its operations in a Profile."""
+    __slots__ = ('profile',)
@@ -0,0 +1,53 @@
+# Lower bounds on the number of boxes needed to pack an instance of the
+# 1-D bin packing problem. A solution that reaches a lower bound is optimal.
+import bisect
+import math
+
+# Tolerance used when rounding up quotients of float weights, so that a sum
+# that should be exactly k boxes is not counted as k + 1.
+EPSILON = 1e-9
+
+def continuous_bound(objects, bin_capacity):
+    """L1: the total weight divided by the box capacity, rounded up."""
+    return _ceil(sum(objects) / float(bin_capacity))
+
+def martello_toth_bound(objects, bin_capacity):
+    """L2 of Martello and Toth. For each K in 0 and the weights <= C/2, the objects
+    heavier than C - K need a box each, as do the ones heavier than C/2, and the
+    objects in [K, C/2] must fit in what those boxes leave free or in new ones."""
+    weights = sorted(objects)
+    prefix = [0]
+    for weight in weights:
+        prefix.append(prefix[-1] + weight)
+    half = bin_capacity / 2.0
+    n_small = bisect.bisect_right(weights, half)
+
+    best = 0
+    candidates = set(weights[:n_small])
+    candidates.add(0)
+    for k in candidates:
+        start_j3 = bisect.bisect_left(weights, k)
+        start_j1 = bisect.bisect_right(weights, bin_capacity - k)
+        n_j1 = len(weights) - start_j1
+        n_j2 = start_j1 - n_small
+        free_j2 = n_j2 * bin_capacity - (prefix[start_j1] - prefix[n_small])
+        weight_j3 = prefix[n_small] - prefix[start_j3]
+        extra = max(0, _ceil((weight_j3 - free_j2) / float(bin_capacity)))
+        best = max(best, n_j1 + n_j2 + extra)
+    return best
+
+def lower_bound(instance):
+    """The best lower bound available for the instance."""
+    return max(continuous_bound(instance.objects, instance.bin_capacity),
+               martello_toth_bound(instance.objects, instance.bin_capacity))
+
+def is_optimal(solution, instance, bound=None):
+    """True if the solution uses as many boxes as the lower bound of the instance.
+    The bound can be given when it was already computed."""
+    if bound is None:
+        bound = lower_bound(instance)
+    return len(solution.boxes) <= bound
+
+def _ceil(value):
+    """Rounds up, ignoring differences smaller than EPSILON."""
+    return int(math.ceil(value - EPSILON))
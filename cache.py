@@ -0,0 +1,79 @@
+# Persistent cache of the results of the algorithms, so an instance that has not
+# changed is not solved again by the same version of the code.
+import os
+import hashlib
+import sqlite3
+
+CODE_FILES = ["binp.py", "localsearch.py"]
+
+def code_version(files=CODE_FILES):
+    """Returns a hash of the source files of the algorithms. Any change to them
+    changes the version, and so every key of the cache."""
+    digest = hashlib.sha256()
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in files:
+        with open(os.path.join(base_dir, name), 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+def instance_key(instance, algorithm, version):
+    """Returns the cache key of an instance solved by algorithm with a version of
+    the code. The objects are hashed in their order, since the algorithms that do
+    not sort them give different results for different orders."""
+    digest = hashlib.sha256()
+    digest.update(repr(instance.bin_capacity).encode())
+    for obj in instance.objects:
+        digest.update(b"|")
+        digest.update(repr(obj).encode())
+    digest.update(b"|" + algorithm.encode() + b"|" + version.encode())
+    return digest.hexdigest()
+
+
+class ResultCache(object):
+    """SQLite file with the number of boxes and the time spent by an algorithm on
+    an instance. It holds at most max_entries results, evicting the least
+    recently used ones."""
+
+    # Each read or write gets a use counter above all the others.
+    _NEXT_USE = "(SELECT COALESCE(MAX(last_used), 0) + 1 FROM results)"
+
+    def __init__(self, path, max_entries=100000, version=None):
+        if max_entries <= 0:
+            raise ValueError("The cache size should be greater than zero.")
+        self.max_entries = max_entries
+        self.version = version if version is not None else code_version()
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results ("
+                                "key TEXT PRIMARY KEY, boxes INTEGER, time_elapsed TEXT, "
+                                "last_used INTEGER)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+    def get(self, instance, algorithm):
+        """Returns the (boxes, time_elapsed) stored for the instance and algorithm,
+        or None."""
+        key = instance_key(instance, algorithm, self.version)
+        row = self.connection.execute("SELECT boxes, time_elapsed FROM results WHERE key = ?",
+                                      (key,)).fetchone()
+        if row is None:
+            return None
+        with self.connection:
+            self.connection.execute("UPDATE results SET last_used = " + self._NEXT_USE +
+                                    " WHERE key = ?", (key,))
+        return row[0], row[1]
+
+    def put(self, instance, algorithm, boxes, time_elapsed):
+        """Stores the result of the algorithm for the instance, evicting the least
+        recently used results above max_entries."""
+        key = instance_key(instance, algorithm, self.version)
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, " +
+                                    self._NEXT_USE + ")", (key, boxes, time_elapsed))
+            self.connection.execute("DELETE FROM results WHERE key IN (SELECT key FROM results "
+                                    "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                                    (self.max_entries,))
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self.connection.close()
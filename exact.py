@@ -0,0 +1,295 @@
+# Exact branch-and-bound for the 1-D bin packing problem: an upper bound from a
+# constructor, the Martello-Toth reduction and L2 bound, and a bin completion
+# search that fills one box at a time with undominated sets of objects.
+import bisect
+import itertools
+import numbers
+import time
+
+from binp import Solution, DescendingSortedBestFitConstructor, descending_order
+from bounds import lower_bound, martello_toth_bound, EPSILON
+from localsearch import improve_solution
+
+# Share of the time limit given to the local search that improves the upper bound.
+UPPER_BOUND_TIME = 0.1
+
+
+class ExactSolver(object):
+    """Branch-and-bound solver with a wall-clock time limit. After solve(),
+    optimal tells whether the returned solution was proven optimal, bound holds
+    the lower bound of the instance and nodes the number of search nodes.
+
+    The search works on counts of the objects left of each weight, changed in
+    place and restored on backtracking, so no state is copied."""
+
+    def __init__(self, instance, time_limit=10.0):
+        if time_limit <= 0:
+            raise ValueError("The time limit should be greater than zero.")
+        self.instance = instance
+        self.time_limit = time_limit
+        self.optimal = False
+        self.bound = None
+        self.nodes = 0
+
+    def solve(self):
+        """Returns the best solution found, proven optimal if optimal is true."""
+        deadline = time.perf_counter() + self.time_limit
+        weights = list(self.instance.objects)
+        capacity = self.instance.bin_capacity
+        if any(weight > capacity for weight in weights):
+            raise ValueError("Impossible to add object to box.")
+
+        order = descending_order(weights)
+        self.bound = lower_bound(self.instance)
+        self.nodes = 0
+        incumbent = self._upper_bound(self.time_limit * UPPER_BOUND_TIME)
+        if len(incumbent) <= self.bound:
+            self.optimal = True
+            return self._build_solution(incumbent)
+
+        fixed, free = self._reduce(order, weights, capacity)
+        self.bound = max(self.bound, len(fixed) + martello_toth_bound([weights[obj] for obj in free], capacity))
+        # Each target number of boxes, from the bound up, is searched until a
+        # packing is found; a search that ends without one raises the bound.
+        while self.bound < len(incumbent):
+            found, completed = self._search(free, weights, capacity, self.bound - len(fixed), deadline)
+            if found is not None:
+                incumbent = fixed + found
+            elif completed:
+                self.bound += 1
+                continue
+            break
+        self.optimal = len(incumbent) <= self.bound
+        return self._build_solution(incumbent)
+
+    def _upper_bound(self, time_limit):
+        """Returns the boxes of the Best Fit Decreasing solution improved by a local
+        search of time_limit seconds."""
+        solution = DescendingSortedBestFitConstructor(self.instance).generate_solution()
+        if len(solution.boxes) > self.bound:
+            solution = improve_solution(solution, time_limit)
+        return [list(solution.boxes[box]) for box in sorted(solution.boxes)]
+
+    def _reduce(self, order, weights, capacity):
+        """Martello-Toth reduction for boxes of at most two objects. Returns the
+        boxes fixed by the reduction and the remaining objects, heaviest first.
+        The heaviest object a gets a box of its own if no other object fits with
+        it, and shares one with the heaviest object b that fits with it if no
+        two other objects fit with it, since that box dominates any other box
+        containing a."""
+        fixed = []
+        free = list(order)
+        while free:
+            heaviest = free[0]
+            space = capacity - weights[heaviest]
+            smallest = free[-2:] if len(free) > 2 else free[1:]
+            if len(free) == 1 or weights[free[-1]] > space:
+                fixed.append([heaviest])
+                free.pop(0)
+            elif len(free) >= 3 and weights[smallest[0]] + weights[smallest[1]] > space:
+                partner = next(obj for obj in free[1:] if weights[obj] <= space)
+                fixed.append([heaviest, partner])
+                free.pop(0)
+                free.remove(partner)
+            else:
+                break
+        return fixed, free
+
+    def _search(self, objects, weights, capacity, target, deadline):
+        """Bin completion search for a packing of objects in target boxes. The
+        boxes are filled one at a time: the heaviest object left goes in the
+        next box with one of the undominated sets of other objects that fill
+        it, the fullest first, while the space left empty in all the boxes stays
+        within target x capacity minus the total weight. Objects of the same
+        weight are interchangeable, so they are counted by weight. Returns the
+        boxes found, or None, and whether the search ended before the deadline."""
+        if not objects:
+            return [], True
+        values = sorted(set(weights[obj] for obj in objects), reverse=True)
+        position = dict((value, idx) for idx, value in enumerate(values))
+        members = [[] for value in values]
+        for obj in objects:
+            members[position[weights[obj]]].append(obj)
+        counts = [len(objs) for objs in members]
+        allowed = target * capacity - sum(weights[obj] for obj in objects) + EPSILON
+        if allowed < 0:
+            return None, True
+        integer = all(isinstance(value, numbers.Integral) for value in values + [capacity])
+        tolerance = 0 if integer else EPSILON
+
+        # Limited discrepancy search: pass d only follows paths that leave the
+        # fullest set for another at most d times, so a wrong choice near the
+        # root is undone without exhausting the subtree below it first. A pass
+        # that never hit the limit has covered the whole tree.
+        discrepancies = 0
+        while True:
+            found, cut = self._dive(values, counts, members, capacity, target, allowed, tolerance,
+                                    discrepancies, deadline)
+            if found is not None or cut is None:
+                return found, cut is not None
+            if not cut:
+                return None, True
+            discrepancies += 1
+
+    def _dive(self, values, counts, members, capacity, target, allowed, tolerance, discrepancies, deadline):
+        """One pass of the search. Returns the boxes found, or None, and whether
+        some set was skipped for the discrepancies, or None at the deadline."""
+        left = sum(counts)
+        waste = 0
+        path = []
+        cut = False
+        frames = [[self._completions(values, counts, capacity, allowed, tolerance), 0, 0]]
+        while frames:
+            self.nodes += 1
+            if self.nodes & 255 == 0 and time.perf_counter() >= deadline:
+                self._restore(counts, path)
+                return None, None
+            frame = frames[-1]
+            completions, choice, used = frame
+            if choice == len(completions) or (choice > 0 and used == discrepancies):
+                cut = cut or choice < len(completions)
+                frames.pop()
+                if path:
+                    slack, items = path.pop()
+                    for idx in items:
+                        counts[idx] += 1
+                    left += len(items)
+                    waste -= slack
+                continue
+            slack, items = completions[choice]
+            frame[1] += 1
+            for idx in items:
+                counts[idx] -= 1
+            left -= len(items)
+            waste += slack
+            path.append((slack, items))
+            if left == 0:
+                boxes = self._boxes(members, path)
+                self._restore(counts, path)
+                return boxes, cut
+            rest = [value for idx, value in enumerate(values) for copy in range(counts[idx])]
+            if len(path) + martello_toth_bound(rest, capacity) > target:
+                frames.append([[], 0, 0])
+                continue
+            frames.append([self._completions(values, counts, capacity, allowed - waste, tolerance), 0,
+                           used + (choice > 0)])
+        return None, cut
+
+    def _restore(self, counts, path):
+        """Puts back in counts the objects of the sets in path."""
+        for slack, items in path:
+            for idx in items:
+                counts[idx] += 1
+
+    def _completions(self, values, counts, capacity, budget, tolerance):
+        """Sets of objects that can fill a box with the heaviest object left,
+        leaving at most budget empty, as (empty space, indexes of their weights
+        in values) pairs, the fullest first. With float weights, objects that
+        fill the box up to tolerance are tried, and a set is kept in an order
+        of its objects that a Solution accepts, if there is one. A set is
+        dropped if it is dominated in the sense of Martello and Toth: if an
+        object left fits in the space it leaves, or if a heavier object left
+        could replace one or two of its objects."""
+        first = 0
+        while counts[first] == 0:
+            first += 1
+        counts[first] -= 1
+        found = []
+        chosen = [first]
+        negated = [-value for value in values]
+        last = len(values) - 1
+        while last >= 0 and counts[last] == 0:
+            last -= 1
+
+        def extend(idx, load):
+            space = capacity - load
+            # Most sets leave room for the lightest object left: skip them early.
+            if (space <= budget and (last < 0 or counts[last] == 0 or values[last] > space - tolerance) and
+                    not self._dominated(values, negated, counts, chosen, space, tolerance)):
+                items = tuple(chosen) if tolerance == 0 else self._fitting_order(values, chosen, capacity)
+                if items is not None:
+                    found.append((space, items))
+            for next_idx in range(max(idx, bisect.bisect_left(negated, -space - tolerance)), len(values)):
+                if counts[next_idx] > 0:
+                    counts[next_idx] -= 1
+                    chosen.append(next_idx)
+                    extend(next_idx, load + values[next_idx])
+                    chosen.pop()
+                    counts[next_idx] += 1
+
+        extend(first, values[first])
+        counts[first] += 1
+        found.sort(key=lambda completion: completion[0])
+        return found
+
+    def _dominated(self, values, negated, counts, chosen, space, tolerance):
+        """True if an object left, counted in counts, fits in space, or could
+        replace one or two of the objects chosen after the first leaving at
+        most space empty. values are sorted from the heaviest. Replacements
+        are only taken with tolerance to spare, so rounding of float weights
+        never drops a set that is not dominated."""
+        last = len(values) - 1
+        while last >= 0 and counts[last] == 0:
+            last -= 1
+        if last >= 0 and values[last] <= space - tolerance:
+            return True
+        for pos in range(1, len(chosen)):
+            weight = values[chosen[pos]]
+            idx = chosen[pos] - 1
+            while idx >= 0 and values[idx] <= weight + space - tolerance:
+                if counts[idx] > 0 and values[idx] >= weight + tolerance:
+                    return True
+                idx -= 1
+            for other in chosen[pos + 1:]:
+                pair = weight + values[other]
+                idx = bisect.bisect_left(negated, -(pair + space - tolerance))
+                while idx < len(values) and values[idx] >= pair + tolerance:
+                    if counts[idx] > 0:
+                        return True
+                    idx += 1
+        return False
+
+    def _fitting_order(self, values, chosen, capacity):
+        """Returns the indexes chosen in an order whose weights, added one at a
+        time, always fit in what is left of capacity, or None."""
+        for items in itertools.permutations(chosen):
+            load = 0
+            for idx in items:
+                if capacity - load < values[idx]:
+                    break
+                load += values[idx]
+            else:
+                return items
+        return None
+
+    def _boxes(self, members, path):
+        """Returns the boxes of the sets in path, taking the objects of each
+        weight in order."""
+        taken = [0] * len(members)
+        boxes = []
+        for slack, items in path:
+            box = []
+            for idx in items:
+                box.append(members[idx][taken[idx]])
+                taken[idx] += 1
+            boxes.append(box)
+        return boxes
+
+    def _build_solution(self, boxes):
+        """Returns a Solution with the boxes, whose objects are positions in the
+        instance."""
+        solution = Solution(self.instance.bin_capacity, max(1, len(self.instance.objects)))
+        for objs in boxes:
+            box = solution.create_box()
+            for obj in objs:
+                if not solution.add_object(obj, self.instance.objects[obj], box):
+                    raise ValueError("Impossible to add object to box.")
+        return solution
+
+
+def solve_exact(instance, time_limit=10.0):
+    """Runs ExactSolver over the instance. Returns the solution and whether it
+    was proven optimal."""
+    solver = ExactSolver(instance, time_limit)
+    solution = solver.solve()
+    return solution, solver.optimal
@@ -0,0 +1,108 @@
+# Export of the box of each object over many solved instances, as CSV, JSON or a
+# NumPy .npz file, with the objects numbered by their position in the instance.
+from binp import *
+import os
+import sys
+import csv
+import json
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FORMATS = {".csv": "csv", ".json": "json", ".npz": "npz"}
+
+def solution_assignment(solution):
+    """Returns the box of each object of the solution, -1 for objects not packed."""
+    if isinstance(solution, CompactSolution):
+        return solution.assignment
+    assignment = array.array('i', [-1]) * len(solution.weights)
+    for box, objs in solution.boxes.items():
+        for obj in objs:
+            assignment[obj] = box
+    return assignment
+
+def solution_results(instances, constructor_class):
+    """Solves each instance with the constructor class, yielding (instance, assignment)."""
+    for instance in instances:
+        yield instance, solution_assignment(constructor_class(instance).generate_solution())
+
+def batch_results(packer, assignments):
+    """Yields (instance, assignment) for each row of the assignments returned by
+    BatchPacker.pack, without the padding."""
+    for row, instance in enumerate(packer.instances):
+        yield instance, assignments[row, :len(instance.objects)]
+
+def export_assignments(results, path, fmt=None):
+    """Writes the (instance, assignment) pairs of results to path, in the format
+    given or the one of its extension. Returns the number of instances written.
+    CSV and JSON are written one instance at a time."""
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt == "csv":
+        return export_csv(results, path)
+    if fmt == "json":
+        return export_json(results, path)
+    if fmt == "npz":
+        return export_npz(results, path)
+    raise ValueError("Unknown export format, use one of: " + ", ".join(sorted(FORMATS.values())))
+
+def export_csv(results, path):
+    """One row per object: instance name, object, weight and box."""
+    count = 0
+    with open(path, 'w', newline='') as output:
+        writer = csv.writer(output)
+        writer.writerow(["instance", "object", "weight", "box"])
+        for instance, assignment in results:
+            writer.writerows((instance.instance_name, obj, _plain(weight), int(box))
+                             for obj, (weight, box) in enumerate(zip(instance.objects, assignment)))
+            count += 1
+    return count
+
+def export_json(results, path):
+    """A list with the name, number of boxes and box of each object of each instance."""
+    count = 0
+    with open(path, 'w') as output:
+        output.write("[")
+        for instance, assignment in results:
+            boxes = [int(box) for box in assignment]
+            record = {"instance": instance.instance_name, "boxes": max(boxes) + 1 if boxes else 0,
+                      "assignment": boxes}
+            output.write((",\n" if count else "\n") + json.dumps(record))
+            count += 1
+        output.write("\n]\n")
+    return count
+
+def export_npz(results, path):
+    """NumPy arrays: names of the instances, the boxes of all the objects one
+    instance after the other (int32) and the offsets where each instance starts,
+    so the boxes of instance i are assignments[offsets[i]:offsets[i + 1]]."""
+    if numpy is None:
+        raise ImportError("Exporting to .npz requires NumPy.")
+    names = []
+    parts = []
+    offsets = [0]
+    for instance, assignment in results:
+        names.append(instance.instance_name)
+        parts.append(numpy.asarray(assignment, dtype=numpy.int32))
+        offsets.append(offsets[-1] + len(parts[-1]))
+    assignments = numpy.concatenate(parts) if parts else numpy.zeros(0, dtype=numpy.int32)
+    numpy.savez(path, names=numpy.array(names, dtype=str), assignments=assignments,
+                offsets=numpy.array(offsets, dtype=numpy.int64))
+    return len(names)
+
+def _plain(weight):
+    """Python number for a weight that may be a NumPy scalar."""
+    return weight.item() if hasattr(weight, "item") else weight
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        sys.exit("usage: python export.py ALGORITHM INSTANCES.txt OUTPUT.(csv|json|npz)")
+    algorithm, instance_file, output_path = sys.argv[1:]
+    if not isinstance(globals().get(algorithm), type) or not issubclass(globals()[algorithm], Constructor):
+        sys.exit("unknown algorithm: " + algorithm)
+    results = solution_results(ORLibraryInstanceReader.iter_instances(instance_file), globals()[algorithm])
+    print("{0} instances written".format(export_assignments(results, output_path)))
@@ -0,0 +1,146 @@
+# Improvement phase for the 1-D bin packing problem. It starts from a solution
+# generated by any constructor and moves objects between the boxes until no
+# move improves it or the time limit is reached.
+import time
+
+
+class LocalSearch(object):
+    """Time-boxed local search over a solution. The moves are: emptying the
+    least-filled box into the others, moving an object to another box and
+    swapping two objects of different boxes. Moves and swaps are accepted when
+    they increase the sum of the squared box loads, which concentrates the
+    weight in fewer boxes. The load of each box is kept up to date, so each
+    candidate move is evaluated in O(1)."""
+
+    def __init__(self, solution, time_limit=1.0):
+        if time_limit <= 0:
+            raise ValueError("The time limit should be greater than zero.")
+        self.solution = solution
+        self.time_limit = time_limit
+
+    def improve(self):
+        """Returns a new solution, of the same class as the initial one, with at
+        most as many boxes."""
+        deadline = time.perf_counter() + self.time_limit
+        self._load_solution()
+        while time.perf_counter() < deadline:
+            if not self._improve_pass(deadline):
+                break
+        return self._build_solution()
+
+    def _load_solution(self):
+        """Copies the boxes, their loads and the object weights to plain lists."""
+        self.weights = list(self.solution.weights)
+        self.box_size = self.solution.box_size
+        self.items = [list(self.solution.boxes[box]) for box in sorted(self.solution.boxes)]
+        self.loads = [self._sum_weights(objs) for objs in self.items]
+
+    def _improve_pass(self, deadline):
+        """Tries the moves once from every box, the least-filled ones first.
+        Returns true if any move was applied."""
+        improved = self._empty_least_filled_box()
+        for source in sorted(range(len(self.items)), key=self.loads.__getitem__):
+            if time.perf_counter() >= deadline:
+                break
+            for obj in list(self.items[source]):
+                if self._move_object(obj, source) or self._swap_object(obj, source):
+                    improved = True
+        return improved
+
+    def _empty_least_filled_box(self):
+        """Moves every object of the least-filled box to the other boxes, the
+        heaviest first into the fullest box that can hold it. Nothing changes if
+        some object does not fit."""
+        used = [box for box in range(len(self.items)) if self.items[box]]
+        if len(used) < 2:
+            return False
+        source = min(used, key=self.loads.__getitem__)
+        loads = list(self.loads)
+        plan = []
+        for obj in sorted(self.items[source], key=self.weights.__getitem__, reverse=True):
+            weight = self.weights[obj]
+            target = None
+            for box in used:
+                if box != source and loads[box] + weight <= self.box_size:
+                    if target is None or loads[box] > loads[target]:
+                        target = box
+            if target is None:
+                return False
+            loads[target] += weight
+            plan.append((obj, target))
+
+        applied = True
+        for obj, target in plan:
+            applied = self._apply(source, target, [obj], []) and applied
+        return applied
+
+    def _move_object(self, obj, source):
+        """Moves obj to the fullest box that can hold it, if that box ends up
+        fuller than source is."""
+        weight = self.weights[obj]
+        source_load = self.loads[source]
+        target = None
+        for box, load in enumerate(self.loads):
+            if box != source and load + weight <= self.box_size and load + weight > source_load:
+                if target is None or load > self.loads[target]:
+                    target = box
+        if target is None:
+            return False
+        return self._apply(source, target, [obj], [])
+
+    def _swap_object(self, obj, source):
+        """Swaps obj with a lighter object of another box, if that box ends up
+        fuller than source is. The first improving swap is applied."""
+        weight = self.weights[obj]
+        source_load = self.loads[source]
+        for box, load in enumerate(self.loads):
+            if box == source:
+                continue
+            for other in self.items[box]:
+                delta = weight - self.weights[other]
+                if delta > 0 and load + delta <= self.box_size and load + delta > source_load:
+                    if self._apply(source, box, [obj], [other]):
+                        return True
+        return False
+
+    def _apply(self, source, target, leaving, arriving):
+        """Moves the objects in leaving from source to target, and the ones in
+        arriving from target to source. The new loads are summed again in the
+        order a Solution would add the objects, and nothing changes if a box
+        would not hold them because of rounding."""
+        new_source = [obj for obj in self.items[source] if obj not in leaving] + arriving
+        new_target = [obj for obj in self.items[target] if obj not in arriving] + leaving
+        source_load = self._sum_weights(new_source)
+        target_load = self._sum_weights(new_target)
+        if source_load is None or target_load is None:
+            return False
+        self.items[source], self.loads[source] = new_source, source_load
+        self.items[target], self.loads[target] = new_target, target_load
+        return True
+
+    def _sum_weights(self, objs):
+        """Returns the load of a box with the objects, or None if a Solution
+        would refuse to add one of them."""
+        load = 0
+        for obj in objs:
+            if self.box_size - load < self.weights[obj]:
+                return None
+            load = load + self.weights[obj]
+        return load
+
+    def _build_solution(self):
+        """Returns a new solution with the non-empty boxes, numbered in order."""
+        solution = self.solution.empty_copy()
+        for objs in self.items:
+            if not objs:
+                continue
+            box = solution.create_box()
+            for obj in objs:
+                if not solution.add_object(obj, self.weights[obj], box):
+                    raise ValueError("Impossible to add object to box.")
+        return solution
+
+
+def improve_solution(solution, time_limit=1.0):
+    """Runs LocalSearch over the solution, returning the improved one."""
+    return LocalSearch(solution, time_limit).improve()
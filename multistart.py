@@ -0,0 +1,178 @@
+# Randomized multi-start for the 1-D bin packing problem. Each start packs the
+# objects with Best Fit over a perturbed or noisy descending order, breaking
+# ties between boxes with about the same space at random, and the best
+# solution of all the starts is kept.
+import bisect
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError
+
+from binp import SortedBestFitConstructor, DescendingSortedBestFitConstructor
+from bounds import lower_bound
+
+
+class RandomizedBestFitConstructor(SortedBestFitConstructor):
+    """Best Fit over a randomized descending order. The weights are sorted with
+    a relative noise of up to noise added to each of them, and then each pair of
+    neighbours is swapped with probability swaps. Among the boxes that can hold
+    an object, one whose space is at most tolerance x capacity above the best
+    fit is chosen at random. The same seed always gives the same solution."""
+
+    def __init__(self, instance, seed=None, noise=0.1, swaps=0.0, tolerance=0.0,
+                 compact=False, profile=None):
+        SortedBestFitConstructor.__init__(self, instance, compact, profile)
+        if noise < 0 or swaps < 0 or tolerance < 0:
+            raise ValueError("The noise, swaps and tolerance should not be negative.")
+        self.random = random.Random(seed)
+        self.noise = noise
+        self.swaps = swaps
+        self.tolerance = tolerance * instance.bin_capacity
+
+    def _get_order(self, objects):
+        rng = self.random
+        keys = [weight * (1 + rng.uniform(-self.noise, self.noise)) for weight in objects]
+        order = sorted(range(len(objects)), key=keys.__getitem__, reverse=True)
+        if self.swaps > 0:
+            for position in range(len(order) - 1):
+                if rng.random() < self.swaps:
+                    order[position], order[position + 1] = order[position + 1], order[position]
+        return order
+
+    def _find_box_that_fits(self, weight, solution):
+        """Return a random box among the ones that can hold the weight with
+        about as little space as the fullest of them. If none, it opens a new box."""
+        entries = self.index.entries
+        first = bisect.bisect_left(entries, (weight, -1))
+        if first == len(entries):
+            return solution.create_box()
+        limit = entries[first][0] + self.tolerance
+        last = bisect.bisect_right(entries, (limit, float("inf")))
+        return entries[self.random.randrange(first, last)][1]
+
+
+class MultiStartSolver(object):
+    """Runs starts constructions of an instance and keeps the solution with the
+    fewest boxes. Start 0 is Best Fit Decreasing, so the result is never worse
+    than it; the odd starts use a noisy order and the even ones a perturbed order,
+    each with its own seed derived from seed. With workers > 1 the starts run in
+    a pool of processes. The search stops once a solution reaches the lower
+    bound of the instance or time_limit seconds have passed.
+
+    After solve(), bound holds the lower bound, starts_run the number of starts
+    whose solution was considered, best_start the start that gave the solution
+    and seed the seed used, so that any start can be repeated."""
+
+    def __init__(self, instance, starts=16, workers=1, seed=None, noise=0.2, swaps=0.2,
+                 tolerance=0.005, time_limit=None):
+        if starts <= 0 or workers <= 0:
+            raise ValueError("The number of starts and workers should be greater than zero.")
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError("The time limit should be greater than zero.")
+        self.instance = instance
+        self.starts = starts
+        self.workers = workers
+        self.seed = seed
+        self.options = (noise, swaps, tolerance)
+        self.time_limit = time_limit
+        self.bound = None
+        self.starts_run = 0
+        self.best_start = None
+
+    def solve(self):
+        """Returns the best solution found."""
+        if self.seed is None:
+            self.seed = random.SystemRandom().getrandbits(64)
+        self.bound = lower_bound(self.instance)
+        self.starts_run = 0
+        self.best_start = None
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        if self.workers == 1:
+            return self._solve_serial(deadline)
+        return self._solve_parallel(deadline)
+
+    def _solve_serial(self, deadline):
+        best = None
+        for start in range(self.starts):
+            solution = run_start(self.instance, start, self.seed, self.options)
+            best = self._keep_best(best, start, solution)
+            if len(best.boxes) <= self.bound:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        return best
+
+    def _solve_parallel(self, deadline):
+        """Sends the instance once to each worker, so tasks only carry the start.
+        The search stops at the lowest start that reaches the lower bound, once
+        all the starts before it have finished, so the result is the one of the
+        serial search unless time_limit ends it first. Pending starts are
+        cancelled when the search stops; the ones already running finish in the
+        background."""
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(self.instance, self.seed, self.options))
+        futures = dict((executor.submit(_run_worker_start, start), start) for start in range(self.starts))
+        solutions = {}
+        finished = 0
+        try:
+            timeout = None if deadline is None else max(0, deadline - time.perf_counter())
+            for future in as_completed(futures, timeout=timeout):
+                solutions[futures[future]] = future.result()
+                while finished in solutions and len(solutions[finished].boxes) > self.bound:
+                    finished += 1
+                if finished in solutions:
+                    solutions = dict((start, solutions[start]) for start in range(finished + 1))
+                    break
+        except TimeoutError:
+            pass
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        best = None
+        for start in sorted(solutions):
+            best = self._keep_best(best, start, solutions[start])
+        if best is None:
+            # Not even one start ended in time: Best Fit Decreasing is the fallback.
+            best = self._keep_best(None, 0, run_start(self.instance, 0, self.seed, self.options))
+        return best
+
+    def _keep_best(self, best, start, solution):
+        """Returns the better of best and the solution of start. Among solutions
+        with the same boxes the lowest start wins."""
+        self.starts_run += 1
+        if (best is None or len(solution.boxes) < len(best.boxes) or
+                (len(solution.boxes) == len(best.boxes) and start < self.best_start)):
+            self.best_start = start
+            return solution
+        return best
+
+
+def run_start(instance, start, seed, options):
+    """Returns the solution of one start. options holds the noise, swaps and
+    tolerance of the randomized starts."""
+    if start == 0:
+        return DescendingSortedBestFitConstructor(instance).generate_solution()
+    noise, swaps, tolerance = options
+    if start % 2 == 1:
+        swaps = 0.0
+    else:
+        noise = 0.0
+    start_seed = "{0}:{1}".format(seed, start)
+    return RandomizedBestFitConstructor(instance, start_seed, noise, swaps, tolerance).generate_solution()
+
+_worker_instance = None
+_worker_seed = None
+_worker_options = None
+
+def _init_worker(instance, seed, options):
+    global _worker_instance, _worker_seed, _worker_options
+    _worker_instance = instance
+    _worker_seed = seed
+    _worker_options = options
+
+def _run_worker_start(start):
+    return run_start(_worker_instance, start, _worker_seed, _worker_options)
+
+def solve_multistart(instance, starts=16, workers=1, seed=None, time_limit=None):
+    """Runs MultiStartSolver over the instance, returning the best solution."""
+    return MultiStartSolver(instance, starts, workers, seed, time_limit=time_limit).solve()
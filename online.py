@@ -0,0 +1,144 @@
+# Online packing for the 1-D bin packing problem: objects are packed one at a
+# time as they arrive, without knowing the next ones.
+from binp import ResidualTree, ResidualIndex
+
+
+class OnlinePacker(object):
+    """Base class of the online packers. push() puts an object in a box and
+    returns the box number. Boxes stay open until close_box() or flush() is
+    called, or until their space available falls below close_below. Each closed
+    box is passed to on_close(box, objects, load) and then forgotten, so the
+    memory used depends only on the open boxes."""
+
+    def __init__(self, bin_capacity, on_close=None, close_below=None):
+        if bin_capacity <= 0:
+            raise ValueError("The bin capacity should be greater than zero.")
+        self.bin_capacity = bin_capacity
+        self.on_close = on_close
+        self.close_below = close_below
+        self.boxes = {}
+        self.loads = {}
+        self.next_box = 0
+
+    def push(self, item_id, size):
+        """Puts the object item_id with the given size in a box, returning the
+        box number."""
+        if size <= 0 or size > self.bin_capacity:
+            raise ValueError("Invalid size passed as argument.")
+
+        box = self._find_box_that_fits(size)
+        if box is None:
+            box = self._open_box()
+        self.boxes[box].append(item_id)
+        self.loads[box] = self.loads[box] + size
+
+        space_available = self.bin_capacity - self.loads[box]
+        if self.close_below is not None and space_available < self.close_below:
+            self.close_box(box)
+        else:
+            self._update_index(box, space_available)
+        return box
+
+    def close_box(self, box):
+        """Closes an open box, so no other object is put in it. Returns the
+        objects in the box."""
+        if box not in self.boxes:
+            raise ValueError("The box is not open.")
+        self._remove_index(box)
+        objects = self.boxes.pop(box)
+        load = self.loads.pop(box)
+        if self.on_close is not None:
+            self.on_close(box, objects, load)
+        return objects
+
+    def flush(self):
+        """Closes every open box, in box number order. Returns how many boxes
+        were closed."""
+        open_boxes = sorted(self.boxes)
+        for box in open_boxes:
+            self.close_box(box)
+        return len(open_boxes)
+
+    def _open_box(self):
+        """Opens a new box, returning its box number"""
+        box = self.next_box
+        self.next_box += 1
+        self.boxes[box] = []
+        self.loads[box] = 0
+        return box
+
+
+class OnlineFirstFit(OnlinePacker):
+    """Online packer that puts each object in the first open box, in the order
+    the boxes were opened, that can hold it. The space available in the open
+    boxes is kept in the leaves of a ResidualTree, in that order. A closed box
+    leaves an unusable leaf, and when those outnumber the open boxes the tree
+    is rebuilt with the open boxes only, so its size depends on the open boxes
+    and not on every box ever opened."""
+
+    MIN_LEAVES = 64
+
+    def __init__(self, bin_capacity, on_close=None, close_below=None):
+        OnlinePacker.__init__(self, bin_capacity, on_close, close_below)
+        self.tree = ResidualTree(self.MIN_LEAVES, bin_capacity)
+        self.leaf_box = []
+        self.box_leaf = {}
+        self.closed_leaves = 0
+
+    def _find_box_that_fits(self, size):
+        leaf = self.tree.find_first(size)
+        if leaf is None or leaf >= len(self.leaf_box):
+            return None
+        return self.leaf_box[leaf]
+
+    def _update_index(self, box, space_available):
+        leaf = self.box_leaf.get(box)
+        if leaf is None:
+            if len(self.leaf_box) == self.tree.leaves:
+                if self.closed_leaves:
+                    self._rebuild_tree()
+                else:
+                    self.tree.grow()
+            leaf = len(self.leaf_box)
+            self.leaf_box.append(box)
+            self.box_leaf[box] = leaf
+        self.tree.update(leaf, space_available)
+
+    def _remove_index(self, box):
+        leaf = self.box_leaf.pop(box, None)
+        if leaf is None:
+            return
+        self.tree.update(leaf, -1)
+        self.leaf_box[leaf] = None
+        self.closed_leaves += 1
+        if self.closed_leaves > len(self.box_leaf) + self.MIN_LEAVES // 2:
+            self._rebuild_tree()
+
+    def _rebuild_tree(self):
+        """Moves the open boxes, in order, to the first leaves of a new tree."""
+        self.leaf_box = [box for box in self.leaf_box if box is not None]
+        self.tree = ResidualTree(max(self.MIN_LEAVES, 2 * len(self.leaf_box)), self.bin_capacity)
+        self.box_leaf = {}
+        for leaf, box in enumerate(self.leaf_box):
+            self.box_leaf[box] = leaf
+            self.tree.update(leaf, self.bin_capacity - self.loads[box])
+        self.closed_leaves = 0
+
+
+class OnlineBestFit(OnlinePacker):
+    """Online packer that puts each object in the fullest open box that can hold
+    it, keeping the open boxes in a ResidualIndex."""
+
+    def __init__(self, bin_capacity, on_close=None, close_below=None):
+        OnlinePacker.__init__(self, bin_capacity, on_close, close_below)
+        self.index = ResidualIndex()
+
+    def _find_box_that_fits(self, size):
+        return self.index.find_best(size)
+
+    def _update_index(self, box, space_available):
+        self.index.update(box, space_available)
+
+    def _remove_index(self, box):
+        if box in self.index.space:
+            self.index.remove(box)
@@ -1,9 +1,15 @@
 # Script to solve the 1-D bin packing instances from OR-Library 
 # utilizing the algorithms implemented in binp.py file.
 from binp import *
+from bounds import lower_bound
+from localsearch import improve_solution
+from cache import ResultCache
 import os
+import json
+import argparse
 import functools
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 INSTANCE_PATH = os.path.join(os.curdir, "instances")
 
@@ -12,46 +18,191 @@ INSTANCE_FILES = ["binpack1.txt", "binpack2.txt", "binpack3.txt"
                   ,"binpack7.txt", "binpack8.txt"]
 
 CONSTRUCTOR_ALGORITHMS = ["FirstFitConstructor", "DescendingFirstFitConstructor"
-                          ,"BestFitConstructor", "DescendingBestFitConstructor"]
+                          ,"BestFitConstructor", "DescendingBestFitConstructor"
+                          ,"TreeFirstFitConstructor", "DescendingTreeFirstFitConstructor"
+                          ,"SortedBestFitConstructor", "DescendingSortedBestFitConstructor"
+                          ,"NextFitConstructor", "NextKFitConstructor", "HarmonicConstructor"]
 
 def timed(f):
     """This function is used as a decorator to measure time spent by each algorithm"""
     @functools.wraps(f)
     def wrapper(*args, **kwds):
-        start = time.clock()
+        start = time.perf_counter()
         result = f(*args, **kwds)
-        end = time.clock()
+        end = time.perf_counter()
         elapsed = "%.2f" % (end - start)
         return elapsed, result
     return wrapper
 
-def execute_exp():
+def execute_exp(skip_optimal=False, local_search=None, cache=None, profiles=None):
     """Execution of the experiment reading the OR-Library instances and running them with
-    all implemented algorithms"""
+    all implemented algorithms. If skip_optimal is true, an instance solved with as many
+    boxes as its lower bound is not solved again by the following algorithms. If
+    local_search is given, each solution is improved by a local search of that many seconds.
+    If cache, a ResultCache, is given, results found in it are not solved again. If profiles,
+    a list, is given, the Profile of each file and algorithm is appended to it as a dict."""
     for instance_file in INSTANCE_FILES:
         instances = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_PATH, instance_file))
+        proven = ProvenOptimal(instances) if skip_optimal else None
         for constructor_name in CONSTRUCTOR_ALGORITHMS:
-            run_algorithm(constructor_name, instances)
+            profile = Profile() if profiles is not None else None
+            run_algorithm(constructor_name, instances, proven, local_search, cache, profile)
+            if profile is not None:
+                result = profile.to_dict()
+                result.update({"file": instance_file, "algorithm": constructor_name})
+                profiles.append(result)
 
-def run_algorithm(algorithm, instances):
+def execute_exp_parallel(workers=None, local_search=None, cache=None):
+    """Same experiment as execute_exp, with each instance x algorithm pair solved by a
+    pool of worker processes. The instances are read once and sent once to each worker,
+    and the results are printed in the same order as execute_exp prints them."""
+    all_instances = [ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_PATH, instance_file))
+                     for instance_file in INSTANCE_FILES]
+    tasks = [(file_idx, algorithm, instance_idx)
+             for file_idx, instances in enumerate(all_instances)
+             for algorithm in CONSTRUCTOR_ALGORITHMS
+             for instance_idx in range(len(instances))]
+
+    cached = {}
+    if cache is not None:
+        for task in tasks:
+            file_idx, algorithm, instance_idx = task
+            result = cache.get(all_instances[file_idx][instance_idx], cache_name(algorithm, local_search))
+            if result is not None:
+                cached[task] = result
+    pending = [task for task in tasks if task not in cached]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(all_instances, local_search)) as executor:
+        solved = executor.map(_solve_task, pending)
+        for task in tasks:
+            file_idx, algorithm, instance_idx = task
+            instance = all_instances[file_idx][instance_idx]
+            if instance_idx == 0:
+                print(algorithm)
+            if task in cached:
+                boxes, time_elapsed = cached[task]
+            else:
+                boxes, time_elapsed = next(solved)
+                if cache is not None:
+                    cache.put(instance, cache_name(algorithm, local_search), boxes, time_elapsed)
+            print(format_result(instance, boxes, time_elapsed))
+
+_worker_instances = None
+_worker_local_search = None
+
+def _init_worker(all_instances, local_search):
+    """Keeps the instances in the worker process, so tasks only carry indexes."""
+    global _worker_instances, _worker_local_search
+    _worker_instances = all_instances
+    _worker_local_search = local_search
+
+def _solve_task(task):
+    """Solves one instance x algorithm task in a worker, returning the number of boxes
+    and the time spent."""
+    file_idx, algorithm, instance_idx = task
+    instance = _worker_instances[file_idx][instance_idx]
+    constructor = globals()[algorithm](instance)
+    time_elapsed, solution = solve_instance(constructor, _worker_local_search)
+    return len(solution.boxes), time_elapsed
+
+def run_algorithm(algorithm, instances, proven=None, local_search=None, cache=None, profile=None):
     """Executes the algorithm for the given instances. The algorithm parameter should be the class 
-    name that implements the algorithm."""
+    name that implements the algorithm. Instances already in proven, a ProvenOptimal, are skipped,
+    and the ones found in cache, a ResultCache, are not solved again. The constructors add their
+    counters to profile, if given."""
     print(algorithm)
     for instance in instances:
-        constructor = globals()[algorithm](instance)
-        time_elapsed, solution = solve_instance(constructor)
-        print(generate_result_string(instance, solution, time_elapsed))
+        if proven is not None and instance in proven.boxes:
+            print(generate_skipped_string(instance, proven.boxes[instance]))
+            continue
+        result = cache.get(instance, cache_name(algorithm, local_search)) if cache is not None else None
+        if result is not None:
+            boxes, time_elapsed = result
+        else:
+            constructor = globals()[algorithm](instance, profile=profile)
+            time_elapsed, solution = solve_instance(constructor, local_search)
+            boxes = len(solution.boxes)
+            if cache is not None:
+                cache.put(instance, cache_name(algorithm, local_search), boxes, time_elapsed)
+        print(format_result(instance, boxes, time_elapsed))
+        if proven is not None:
+            proven.check(instance, boxes)
+
+def cache_name(algorithm, local_search=None):
+    """Returns the name of the algorithm in the cache, which includes the local search."""
+    if local_search:
+        return "{0}+LocalSearch({1})".format(algorithm, local_search)
+    return algorithm
+
+class ProvenOptimal(object):
+    """Keeps the lower bound of each instance and the number of boxes of the
+    instances already solved with as many boxes as their bound."""
+
+    def __init__(self, instances):
+        self.bounds = dict((instance, lower_bound(instance)) for instance in instances)
+        self.boxes = {}
+
+    def check(self, instance, boxes):
+        """Records the instance as solved if the number of boxes of its solution
+        reaches its lower bound."""
+        if boxes <= self.bounds[instance]:
+            self.boxes[instance] = boxes
 
 @timed
-def solve_instance(constructor):
-    """It simply calls the generate_solution() method. Defined in a function to be timed alone."""
-    return constructor.generate_solution()
+def solve_instance(constructor, local_search=None):
+    """It simply calls the generate_solution() method, followed by a local search of local_search
+    seconds if given. Defined in a function to be timed alone."""
+    solution = constructor.generate_solution()
+    if local_search:
+        solution = improve_solution(solution, local_search)
+    return solution
 
 def generate_result_string(instance, solution, time_elapsed):
     """Returns a string representing the results of a algorithm.
     It is in format: instance_name boxes_in_solution boxes_in_best_known_solution time_spent"""
-    return "{0}\t{1}\t{2}\t{3}".format(instance.instance_name, len(solution.boxes), 
+    return format_result(instance, len(solution.boxes), time_elapsed)
+
+def format_result(instance, boxes, time_elapsed):
+    """Same as generate_result_string, given the number of boxes in the solution."""
+    return "{0}\t{1}\t{2}\t{3}".format(instance.instance_name, boxes,
                                        instance.best_known_sol, time_elapsed)
 
+def generate_skipped_string(instance, boxes):
+    """Returns the result string of an instance skipped because a previous algorithm
+    already reached its lower bound with the given number of boxes."""
+    return "{0}\t{1}\t{2}\tskipped".format(instance.instance_name, boxes, instance.best_known_sol)
+
 if __name__ == "__main__":
-    execute_exp()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Solves the OR-Library instances with all algorithms.")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="number of worker processes (default: 1, no pool)")
+    parser.add_argument("--skip-optimal", action="store_true",
+                        help="skip instances that a previous algorithm solved to the lower bound")
+    parser.add_argument("--local-search", type=float, default=None, metavar="SECONDS",
+                        help="improve each solution with a local search of SECONDS")
+    parser.add_argument("--cache", default=None, metavar="FILE",
+                        help="SQLite file where results are kept between runs")
+    parser.add_argument("--cache-size", type=int, default=100000,
+                        help="maximum number of results in the cache")
+    parser.add_argument("--profile", default=None, metavar="FILE",
+                        help="write counters and timings of each algorithm as JSON to FILE ('-' for stdout)")
+    args = parser.parse_args()
+    cache = ResultCache(args.cache, args.cache_size) if args.cache else None
+    profiles = [] if args.profile else None
+
+    if args.workers > 1:
+        if args.skip_optimal:
+            parser.error("--skip-optimal needs the algorithms to run in order, without --workers")
+        if args.profile:
+            parser.error("--profile is only available without --workers")
+        execute_exp_parallel(args.workers, args.local_search, cache)
+    else:
+        execute_exp(args.skip_optimal, args.local_search, cache, profiles)
+
+    if profiles is not None:
+        if args.profile == "-":
+            print(json.dumps(profiles, indent=2))
+        else:
+            with open(args.profile, "w") as output:
+                json.dump(profiles, output, indent=2)
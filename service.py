@@ -0,0 +1,349 @@
+# Asyncio packing service. Requests are instances sent as JSON lines over TCP;
+# concurrent requests are coalesced into batches that a pool of worker processes
+# packs with the constructors of binp.py, so the event loop never runs the
+# packing itself. A load generator measures the throughput and latency of a
+# running service.
+from binp import *
+from export import solution_assignment
+from benchmark import constructor_algorithms, percentile, synthetic_instance
+import os
+import sys
+import numbers
+import json
+import time
+import random
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_ALGORITHM = "DescendingSortedBestFitConstructor"
+
+# Longest request or answer line, in bytes, read by the server and the load
+# generator. A 10^5-object request or answer takes about 1 MiB.
+LINE_LIMIT = 2**24
+
+# Returned by read_line() in place of a line longer than the limit.
+TOO_LARGE = b"too large\n"
+
+# Constructors that can be requested, by name. Only the ones of binp.py are
+# listed, whatever other Constructor subclasses the process has imported.
+CONSTRUCTORS = dict((name, globals()[name]) for name in constructor_algorithms() if name in globals())
+
+
+class ServiceOverloaded(Exception):
+    """Raised when a request arrives while max_pending requests are waiting."""
+    pass
+
+
+class PackingService(object):
+    """Packs instances for concurrent callers of pack(). Requests wait in a
+    queue of at most max_pending; a request that finds it full is rejected with
+    ServiceOverloaded instead of waiting. A dispatcher takes up to max_batch
+    requests, waiting at most max_delay seconds for the batch to fill, and sends
+    them to the executor as one task. At most one batch per worker is in flight,
+    so the queue fills when the workers cannot keep up. A request that takes
+    more than timeout seconds fails with asyncio.TimeoutError.
+
+    If an executor is given, workers is the number of batches sent to it at a
+    time."""
+
+    def __init__(self, workers=None, max_batch=32, max_delay=0.002, max_pending=1024,
+                 timeout=5.0, executor=None):
+        if max_batch <= 0 or max_pending <= 0:
+            raise ValueError("The batch size and the queue size should be greater than zero.")
+        if max_delay < 0 or timeout <= 0:
+            raise ValueError("The delay should not be negative and the timeout should be greater than zero.")
+        self.executor = executor
+        self.own_executor = executor is None
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.queue = None
+        self.slots = None
+        self.dispatcher = None
+        self.batches = 0
+
+    async def start(self):
+        """Starts the executor, if none was given, and the dispatcher."""
+        if self.own_executor:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.slots = asyncio.Semaphore(self.workers or os.cpu_count() or 1)
+        self.queue = asyncio.Queue(self.max_pending)
+        self.dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def close(self):
+        """Stops the dispatcher, failing the requests still queued, and shuts
+        down the executor if the service created it."""
+        self.dispatcher.cancel()
+        try:
+            await self.dispatcher
+        except asyncio.CancelledError:
+            pass
+        while not self.queue.empty():
+            request, future = self.queue.get_nowait()
+            if not future.done():
+                future.set_exception(ServiceOverloaded("The service is closed."))
+        if self.own_executor:
+            self.executor.shutdown()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def pack(self, instance, algorithm=DEFAULT_ALGORITHM, timeout=None):
+        """Packs an Instance with the algorithm named after its constructor class.
+        Returns a dict with the number of boxes and the box of each object. The
+        request fails after timeout seconds, or the timeout of the service if
+        None. Invalid arguments raise ValueError before the request is queued."""
+        if not isinstance(algorithm, str) or algorithm not in CONSTRUCTORS:
+            raise ValueError("Unknown algorithm: {0}".format(algorithm))
+        if timeout is None:
+            timeout = self.timeout
+        if not isinstance(timeout, numbers.Real) or isinstance(timeout, bool) or not timeout > 0:
+            raise ValueError("The timeout should be a number greater than zero.")
+        future = asyncio.get_running_loop().create_future()
+        request = (algorithm, instance.bin_capacity, list(instance.objects))
+        try:
+            self.queue.put_nowait((request, future))
+        except asyncio.QueueFull:
+            raise ServiceOverloaded("Too many pending requests.")
+        return await asyncio.wait_for(future, timeout)
+
+    async def _dispatch(self):
+        """Takes batches from the queue and sends them to the executor. The
+        requests whose caller gave up while the batch waited for a worker are
+        dropped before sending it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                if self.queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.queue.get_nowait())
+            try:
+                await self.slots.acquire()
+            except asyncio.CancelledError:
+                for request, future in batch:
+                    if not future.done():
+                        future.set_exception(ServiceOverloaded("The service is closed."))
+                raise
+            batch = [(request, future) for request, future in batch if not future.done()]
+            if not batch:
+                self.slots.release()
+                continue
+            self.batches += 1
+            task = loop.run_in_executor(self.executor, pack_batch, [request for request, future in batch])
+            task.add_done_callback(lambda task, batch=batch: self._deliver(task, batch))
+
+    def _deliver(self, task, batch):
+        """Sets the result of each request of a finished batch."""
+        self.slots.release()
+        if task.cancelled():
+            return
+        error = task.exception()
+        for idx, (request, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+                continue
+            status, result = task.result()[idx]
+            if status == "ok":
+                future.set_result(result)
+            else:
+                future.set_exception(ValueError(result))
+
+
+def pack_batch(requests):
+    """Packs each (algorithm, capacity, objects) request in a worker process.
+    Returns a ("ok", result) or ("error", message) pair per request, so an
+    invalid instance does not fail the rest of the batch."""
+    results = []
+    for algorithm, capacity, objects in requests:
+        try:
+            instance = Instance("request", capacity, objects, 0)
+            solution = CONSTRUCTORS[algorithm](instance).generate_solution()
+            results.append(("ok", {"boxes": len(solution.boxes),
+                                   "assignment": list(solution_assignment(solution))}))
+        except ValueError as error:
+            results.append(("error", str(error)))
+    return results
+
+def instance_from_payload(payload):
+    """Returns the Instance of a request payload, a dict with the capacity and
+    the objects."""
+    try:
+        capacity, objects = payload["capacity"], payload["objects"]
+    except (KeyError, TypeError):
+        raise ValueError("A request needs a capacity and objects.")
+    if not isinstance(objects, list) or not objects:
+        raise ValueError("The objects should be a non-empty list.")
+    if not all(isinstance(value, numbers.Real) and not isinstance(value, bool) and value > 0
+               for value in objects + [capacity]):
+        raise ValueError("The capacity and the objects should be positive numbers.")
+    return Instance(str(payload.get("name", "request")), capacity, objects, 0)
+
+async def handle_connection(service, reader, writer):
+    """Serves a connection: each line is a JSON request, answered with a JSON
+    line that has the same id. The requests of a connection are packed
+    concurrently, so the answers may come back in another order."""
+    pending = set()
+    lock = asyncio.Lock()
+    try:
+        while True:
+            line = await read_line(reader)
+            if not line:
+                break
+            task = asyncio.ensure_future(_answer(service, line, writer, lock))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.wait(pending)
+    finally:
+        writer.close()
+
+async def read_line(reader):
+    """Returns the next line of the reader, or b"" at the end of the stream. A
+    line longer than the limit of the reader is skipped and returned as
+    TOO_LARGE, so the connection can go on with the next one."""
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        consumed = error.consumed
+    while True:
+        try:
+            await reader.readexactly(consumed)
+            await reader.readuntil(b"\n")
+            return TOO_LARGE
+        except asyncio.IncompleteReadError:
+            return TOO_LARGE
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+async def _answer(service, line, writer, lock):
+    response = {}
+    try:
+        if line is TOO_LARGE:
+            raise ValueError("too large")
+        payload = json.loads(line)
+        response["id"] = payload.get("id")
+        instance = instance_from_payload(payload)
+        response.update(await service.pack(instance, payload.get("algorithm", DEFAULT_ALGORITHM),
+                                           payload.get("timeout")))
+    except asyncio.TimeoutError:
+        response["error"] = "timeout"
+    except ServiceOverloaded as error:
+        response["error"] = "overloaded: {0}".format(error)
+    except (ValueError, AttributeError) as error:
+        response["error"] = "invalid request: {0}".format(error)
+    except Exception as error:
+        # Any other failure is answered too, so the client is not left waiting.
+        response["error"] = "internal error: {0}".format(error)
+    async with lock:
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+async def serve(host="127.0.0.1", port=8765, limit=LINE_LIMIT, **options):
+    """Runs a PackingService with the options behind a TCP server until cancelled.
+    Requests longer than limit bytes are answered with an error."""
+    async with PackingService(**options) as service:
+        server = await asyncio.start_server(lambda reader, writer: handle_connection(service, reader, writer),
+                                            host, port, limit=limit)
+        async with server:
+            await server.serve_forever()
+
+async def run_load(host="127.0.0.1", port=8765, requests=1000, concurrency=32, n_objects=100,
+                   algorithm=DEFAULT_ALGORITHM, seed=0, limit=LINE_LIMIT):
+    """Sends requests synthetic instances of n_objects to a service, keeping
+    concurrency of them in flight on as many connections. Returns the throughput
+    and the latency percentiles, in milliseconds, of the answered requests.
+    Answers longer than limit bytes are counted as errors."""
+    rng = random.Random(seed)
+    payloads = []
+    for idx in range(requests):
+        instance = synthetic_instance(n_objects, rng.getrandbits(32))
+        payloads.append({"id": idx, "capacity": instance.bin_capacity,
+                         "objects": instance.objects, "algorithm": algorithm})
+    latencies = []
+    errors = []
+    next_payload = iter(payloads)
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port, limit=limit)
+        try:
+            for payload in next_payload:
+                start = time.perf_counter()
+                writer.write(json.dumps(payload).encode() + b"\n")
+                await writer.drain()
+                line = await read_line(reader)
+                if not line:
+                    errors.append("connection closed")
+                    break
+                response = {"error": "answer too large"} if line is TOO_LARGE else json.loads(line)
+                if "error" in response:
+                    errors.append(response["error"])
+                else:
+                    latencies.append((time.perf_counter() - start) * 1000.0)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for idx in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    report = {"requests": requests, "concurrency": concurrency, "objects": n_objects,
+              "errors": len(errors), "seconds": elapsed, "throughput": len(latencies) / elapsed}
+    if latencies:
+        report.update({"p50_ms": percentile(latencies, 50), "p99_ms": percentile(latencies, 99),
+                       "max_ms": latencies[-1]})
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Packing service and its load generator.")
+    parser.add_argument("mode", choices=["serve", "load"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="worker processes of the service (default: one per CPU)")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-delay", type=float, default=0.002, metavar="SECONDS")
+    parser.add_argument("--max-pending", type=int, default=1024)
+    parser.add_argument("--timeout", type=float, default=5.0, metavar="SECONDS")
+    parser.add_argument("-n", "--requests", type=int, default=1000)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("--objects", type=int, default=100, help="objects per synthetic instance")
+    parser.add_argument("-a", "--algorithm", default=DEFAULT_ALGORITHM)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=LINE_LIMIT, metavar="BYTES",
+                        help="longest request or answer line (default: 16 MiB)")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, workers=args.workers, max_batch=args.max_batch,
+                              max_delay=args.max_delay, max_pending=args.max_pending,
+                              timeout=args.timeout, limit=args.limit))
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(run_load(args.host, args.port, args.requests, args.concurrency,
+                                      args.objects, args.algorithm, args.seed, args.limit))
+        json.dump(report, sys.stdout, indent=2)
+        print()
@@ -0,0 +1,54 @@
+import unittest
+import os
+from binp import *
+from batch import *
+
+INSTANCE_DIR = os.path.join(os.curdir, "instances")
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class BatchPackerTest(unittest.TestCase):
+    def test_batch_packer_with_no_instances_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            BatchPacker([])
+
+    def test_batch_packer_with_weight_bigger_than_box_capacity_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            BatchPacker([Instance("inst_name", 5, [6, 10, 4, 5], 3)])
+
+    def test_pack_with_unknown_algorithm_should_raise_valueerror(self):
+        packer = BatchPacker([Instance("inst_name", 10, [6, 10, 4, 5], 3)])
+        with self.assertRaises(ValueError):
+            packer.pack("UnknownConstructor")
+
+    def test_first_fit_should_return_boxes_of_each_object(self):
+        packer = BatchPacker([Instance("inst_1", 10, [6, 10, 4, 5], 3),
+                              Instance("inst_2", 10, [5, 6, 4], 2)])
+        assignments, bin_counts = packer.first_fit()
+        self.assertEqual([0, 1, 0, 2], list(assignments[0]))
+        self.assertEqual([0, 1, 0, -1], list(assignments[1]))
+        self.assertEqual([3, 2], list(bin_counts))
+
+    def test_best_fit_should_return_boxes_of_each_object(self):
+        packer = BatchPacker([Instance("inst_1", 10, [5, 6, 4, 5], 2)])
+        assignments, bin_counts = packer.best_fit()
+        self.assertEqual([0, 1, 1, 0], list(assignments[0]))
+        self.assertEqual([2], list(bin_counts))
+
+    def test_batch_packer_with_integer_instances_should_use_int64(self):
+        packer = BatchPacker([Instance("inst_1", 10, [6, 10, 4, 5], 3)])
+        self.assertEqual(numpy.int64, packer.objects.dtype)
+        packer = BatchPacker([Instance("inst_1", 10, [6, 10, 4, 5], 3), Instance("inst_2", 1.0, [0.5], 1)])
+        self.assertEqual(numpy.float64, packer.objects.dtype)
+
+    def test_pack_should_return_same_boxes_as_constructors(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack5.txt"))
+        instances = instances[:4] + [Instance("short", 1, [0.5, 0.6, 0.2], 2)]
+        packer = BatchPacker(instances)
+        for algorithm in BatchPacker.ALGORITHMS:
+            assignments, bin_counts = packer.pack(algorithm)
+            for row, instance in enumerate(instances):
+                solution = globals()[algorithm](instance).generate_solution()
+                self.assertEqual(len(solution.boxes), bin_counts[row])
+                for box, objs in solution.boxes.items():
+                    for obj in objs:
+                        self.assertEqual(box, assignments[row, obj])
@@ -0,0 +1,58 @@
+import unittest
+from binp import *
+from benchmark import *
+
+class BenchmarkTest(unittest.TestCase):
+    def test_constructor_algorithms_should_list_every_constructor(self):
+        algorithms = constructor_algorithms()
+        self.assertIn("FirstFitConstructor", algorithms)
+        self.assertIn("DescendingBestFitConstructor", algorithms)
+        self.assertIn("TreeFirstFitConstructor", algorithms)
+        self.assertNotIn("Constructor", algorithms)
+
+    def test_synthetic_instance_with_same_seed_should_be_equal(self):
+        first = synthetic_instance(100, 7)
+        second = synthetic_instance(100, 7)
+        self.assertEqual(100, len(first.objects))
+        self.assertEqual(first.objects, second.objects)
+        self.assertNotEqual(first.objects, synthetic_instance(100, 8).objects)
+
+    def test_synthetic_instance_should_be_integer(self):
+        self.assertTrue(is_integer_instance(synthetic_instance(10, 1)))
+
+    def test_percentile_should_interpolate_between_ranks(self):
+        values = [10, 20, 30, 40]
+        self.assertEqual(10, percentile(values, 0))
+        self.assertEqual(25, percentile(values, 50))
+        self.assertEqual(40, percentile(values, 100))
+
+    def test_percentile_with_empty_list_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            percentile([], 50)
+
+    def test_benchmark_case_should_return_samples_of_each_repeat(self):
+        instance = Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        result = benchmark_case("FirstFitConstructor", [instance], repeats=3, warmup=1)
+        self.assertEqual(3, len(result["samples_ns"]))
+        self.assertEqual(3, result["boxes"])
+        self.assertEqual(4, result["objects"])
+        self.assertTrue(result["min_ns"] <= result["median_ns"] <= result["max_ns"])
+
+    def test_benchmark_case_without_repeats_should_raise_valueerror(self):
+        instance = Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        with self.assertRaises(ValueError):
+            benchmark_case("FirstFitConstructor", [instance], repeats=0)
+
+    def test_benchmark_case_should_stop_repeating_once_a_run_exceeds_the_budget(self):
+        instance = Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        result = benchmark_case("FirstFitConstructor", [instance], repeats=5, warmup=1, budget=0)
+        self.assertEqual(1, len(result["samples_ns"]))
+        self.assertTrue(result["stopped"])
+
+    def test_run_benchmark_should_skip_sizes_predicted_to_exceed_the_budget(self):
+        report = run_benchmark(["FirstFitConstructor"], [10, 10**6], repeats=1, warmup=0,
+                               budget=1e-3, files=[])
+        first, second = report["results"]
+        self.assertFalse(first["stopped"])
+        self.assertTrue(second["skipped"])
+
@@ -0,0 +1,108 @@
+import unittest
+import os
+import shutil
+import struct
+import tempfile
+import binary_instances
+from binp import *
+from binary_instances import *
+
+TEST_DIR = os.path.join(os.curdir, "tests")
+DATA_DIR = os.path.join(TEST_DIR, "data")
+
+class BinaryInstancesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "instances.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_convert_should_return_number_of_instances(self):
+        self.assertEqual(2, convert(os.path.join(DATA_DIR, "inst2.txt"), self.path))
+
+    def test_binary_instance_file_should_read_converted_instances(self):
+        convert(os.path.join(DATA_DIR, "inst2.txt"), self.path)
+        with BinaryInstanceFile(self.path) as instances:
+            self.assertEqual(2, len(instances))
+            self.assertEqual(["inst_01", "inst_02"], instances.names())
+            inst = instances[1]
+            self.assertEqual("inst_02", inst.instance_name)
+            self.assertEqual(50, inst.bin_capacity)
+            self.assertIsInstance(inst.bin_capacity, int)
+            self.assertEqual(2, inst.best_known_sol)
+            self.assertEqual([10, 20, 30, 40], list(inst.objects))
+            del inst
+
+    def test_binary_instance_file_with_float_instance_should_keep_floats(self):
+        convert(os.path.join(DATA_DIR, "inst3.txt"), self.path)
+        with BinaryInstanceFile(self.path) as instances:
+            inst = instances.get("inst_03")
+            self.assertEqual(100.0, inst.bin_capacity)
+            self.assertIsInstance(inst.bin_capacity, float)
+            self.assertEqual([44.6, 30.0, 25.4], list(inst.objects))
+            del inst
+
+    def test_get_with_unknown_name_should_return_none(self):
+        convert(os.path.join(DATA_DIR, "inst1.txt"), self.path)
+        with BinaryInstanceFile(self.path) as instances:
+            self.assertIsNone(instances.get("unknown"))
+
+    def test_binary_instance_file_with_other_file_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            BinaryInstanceFile(os.path.join(DATA_DIR, "inst1.txt"))
+
+    def test_write_instances_with_long_name_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            write_instances([Instance("x" * 65, 10, [5], 1)], self.path)
+
+    def test_write_instances_with_big_integers_should_use_int64(self):
+        write_instances([Instance("big", 2**40, [2**33, 2**39], 1)], self.path)
+        with BinaryInstanceFile(self.path) as instances:
+            self.assertEqual([2**33, 2**39], [int(obj) for obj in instances[0].objects])
+
+    def test_write_instances_should_store_objects_in_little_endian(self):
+        write_instances([Instance("small", 10, [1, 2], 1), Instance("big", 2**40, [2**33], 1)], self.path)
+        with open(self.path, 'rb') as stored:
+            data = stored.read()
+        start = FILE_HEADER.size + INSTANCE_HEADER.size
+        self.assertEqual(struct.pack("<2i", 1, 2), data[start:start + 8])
+        start += 8 + INSTANCE_HEADER.size
+        self.assertEqual(struct.pack("<q", 2**33), data[start:start + 8])
+
+    def test_generate_solution_with_binary_instance_should_be_equal_to_text_instance(self):
+        text_path = os.path.join(os.curdir, "instances", "binpack1.txt")
+        convert(text_path, self.path)
+        expected = ORLibraryInstanceReader.get_instances(text_path)[3]
+        with BinaryInstanceFile(self.path) as instances:
+            inst = instances[3]
+            solution = FirstFitConstructor(inst).generate_solution()
+            self.assertEqual(FirstFitConstructor(expected).generate_solution().boxes, solution.boxes)
+            del inst
+
+    def test_constructors_with_binary_instance_should_be_equal_to_text_instance(self):
+        text_path = os.path.join(os.curdir, "instances", "binpack1.txt")
+        convert(text_path, self.path)
+        expected = ORLibraryInstanceReader.get_instances(text_path)[0]
+        algorithms = [DescendingFirstFitConstructor, BestFitConstructor, TreeFirstFitConstructor,
+                      DescendingSortedBestFitConstructor, BucketBestFitConstructor,
+                      DescendingBucketBestFitConstructor, NextKFitConstructor, HarmonicConstructor]
+        with BinaryInstanceFile(self.path) as instances:
+            inst = instances[0]
+            for constructor_class in algorithms:
+                solution = constructor_class(inst).generate_solution()
+                self.assertEqual(constructor_class(expected).generate_solution().boxes, solution.boxes)
+            del inst
+
+    def test_binary_instance_file_without_numpy_should_return_memoryview(self):
+        convert(os.path.join(DATA_DIR, "inst2.txt"), self.path)
+        saved_numpy = binary_instances.numpy
+        binary_instances.numpy = None
+        try:
+            with BinaryInstanceFile(self.path) as instances:
+                objects = instances[0].objects
+                self.assertIsInstance(objects, memoryview)
+                self.assertEqual([42, 69, 30], list(objects))
+                objects.release()
+        finally:
+            binary_instances.numpy = saved_numpy
@@ -1,5 +1,6 @@
 import unittest
 import os
+import array
 from binp import *
 
 TEST_DIR = os.path.join(os.curdir, "tests")
@@ -55,6 +56,51 @@ class ORLibraryInstanceReaderTest(unittest.TestCase):
         self.assertEqual([10, 20, 30, 40], ret[1].objects)
 
 
+    def test_iter_instances_with_inst2_should_yield_instances_one_at_a_time(self):
+        instances = ORLibraryInstanceReader.iter_instances(os.path.join(DATA_DIR, "inst2.txt"))
+
+        first = next(instances)
+        self.assertEqual("inst_01", first.instance_name)
+        self.assertEqual([42, 69, 30], first.objects)
+        second = next(instances)
+        self.assertEqual("inst_02", second.instance_name)
+        self.assertEqual([10, 20, 30, 40], second.objects)
+        with self.assertRaises(StopIteration):
+            next(instances)
+
+    def test_iter_instances_compact_should_store_objects_in_array(self):
+        ret = list(ORLibraryInstanceReader.iter_instances(os.path.join(DATA_DIR, "inst2.txt"), compact=True))
+
+        self.assertIsInstance(ret[1].objects, array.array)
+        self.assertEqual('q', ret[1].objects.typecode)
+        self.assertEqual([10, 20, 30, 40], list(ret[1].objects))
+
+    def test_get_instances_with_integer_data_should_return_ints(self):
+        ret = ORLibraryInstanceReader.get_instances(os.path.join(DATA_DIR, "inst2.txt"))
+
+        self.assertIsInstance(ret[0].bin_capacity, int)
+        self.assertTrue(all(isinstance(obj, int) for obj in ret[0].objects))
+
+    def test_get_instances_with_float_data_should_return_floats(self):
+        ret = ORLibraryInstanceReader.get_instances(os.path.join(DATA_DIR, "inst3.txt"))
+
+        self.assertIsInstance(ret[0].bin_capacity, float)
+        self.assertEqual(100, ret[0].bin_capacity)
+        self.assertEqual([44.6, 30.0, 25.4], ret[0].objects)
+        self.assertTrue(all(isinstance(obj, float) for obj in ret[0].objects))
+
+    def test_iter_instances_compact_with_float_data_should_store_objects_in_double_array(self):
+        ret = list(ORLibraryInstanceReader.iter_instances(os.path.join(DATA_DIR, "inst3.txt"), compact=True))
+
+        self.assertEqual('d', ret[0].objects.typecode)
+        self.assertEqual([44.6, 30.0, 25.4], list(ret[0].objects))
+
+    def test_generate_solution_with_compact_instance_should_return_a_solution(self):
+        inst = next(ORLibraryInstanceReader.iter_instances(os.path.join(DATA_DIR, "inst1.txt"), compact=True))
+        solution = FirstFitConstructor(inst).generate_solution()
+        self.assertEqual(2, len(solution.boxes))
+
+
 class InstanceTest(unittest.TestCase):
     def test_Instance_object_should_receive_data_in_init_method(self):
         inst = Instance("name", 100, [30, 20], 1)
@@ -65,6 +111,14 @@ class InstanceTest(unittest.TestCase):
         self.assertEqual([30, 20], inst.objects)
 
 
+    def test_is_integer_instance_with_int_data_should_return_true(self):
+        self.assertTrue(is_integer_instance(Instance("name", 100, [30, 20], 1)))
+
+    def test_is_integer_instance_with_float_data_should_return_false(self):
+        self.assertFalse(is_integer_instance(Instance("name", 100, [30, 20.5], 1)))
+        self.assertFalse(is_integer_instance(Instance("name", 100.0, [30, 20], 1)))
+
+
 class SolutionTest(unittest.TestCase):
     def test_solution_of_size_3_should_have_weights_with_zeros(self):
         solution = Solution(1, 3)
@@ -183,10 +237,19 @@ class SolutionTest(unittest.TestCase):
 
     def test_amount_space_available_box_with_full_box_should_return_0(self):
         solution = Solution(5, 2)
-        solution.boxes[0] = [0]
-        solution.weights[0] = 5
+        solution.create_box()
+        solution.add_object(0, 5, 0)
         self.assertEqual(0, solution.amount_space_available_box(0))
 
+    def test_loads_should_track_weight_added_to_each_box(self):
+        solution = Solution(10, 3)
+        solution.create_box()
+        solution.create_box()
+        solution.add_object(0, 3, 0)
+        solution.add_object(1, 4, 0)
+        solution.add_object(2, 6, 1)
+        self.assertEqual({0: 7, 1: 6}, solution.loads)
+
     def test_amount_space_available_box_with_empty_box_should_return_box_capacity(self):
         solution = Solution(5, 2)
         solution.boxes[0] = []
@@ -194,10 +257,76 @@ class SolutionTest(unittest.TestCase):
 
     def test_amount_space_available_box_with_box_space_equal_3_should_return_3(self):
         solution = Solution(5, 2)
-        solution.boxes[0] = [0]
-        solution.weights[0] = 2
+        solution.create_box()
+        solution.add_object(0, 2, 0)
         self.assertEqual(3, solution.amount_space_available_box(0))
 
+
+
+class CompactSolutionTest(unittest.TestCase):
+    def test_compact_solution_of_invalid_size_should_raise_error(self):
+        with self.assertRaises(ValueError):
+            solution = CompactSolution(1, 0)
+
+    def test_add_object_without_box_should_return_false(self):
+        solution = CompactSolution(5, 2)
+        self.assertFalse(solution.add_object(0, 3, 0))
+
+    def test_add_object_with_weight_bigger_than_space_available_should_return_false(self):
+        solution = CompactSolution(5, 2)
+        solution.create_box()
+        solution.add_object(0, 3, 0)
+        self.assertFalse(solution.add_object(1, 3, 0))
+        self.assertEqual(2, solution.amount_space_available_box(0))
+
+    def test_boxes_view_should_list_objects_of_each_box(self):
+        solution = CompactSolution(5, 3)
+        self.assertEqual(0, solution.create_box())
+        self.assertEqual(1, solution.create_box())
+        solution.add_object(0, 3, 0)
+        solution.add_object(1, 4, 1)
+        solution.add_object(2, 2, 0)
+        self.assertEqual(2, len(solution.boxes))
+        self.assertEqual([0, 2], solution.boxes[0])
+        self.assertEqual([1], solution.boxes[1])
+        self.assertEqual({0: [0, 2], 1: [1]}, solution.boxes)
+        self.assertEqual([0, 1, 0], list(solution.assignment))
+        self.assertEqual([3, 4, 2], list(solution.weights))
+
+    def test_empty_copy_should_keep_integer_mode(self):
+        for integer, typecode in ((True, 'q'), (False, 'd')):
+            solution = CompactSolution(10, 3, integer)
+            solution.create_box()
+            copy = solution.empty_copy()
+            self.assertIsInstance(copy, CompactSolution)
+            self.assertEqual(typecode, copy.weights.typecode)
+            self.assertEqual(3, len(copy.weights))
+            self.assertEqual(0, len(copy.boxes))
+
+    def test_boxes_view_with_unknown_box_should_raise_keyerror(self):
+        solution = CompactSolution(5, 2)
+        solution.create_box()
+        self.assertNotIn(1, solution.boxes)
+        with self.assertRaises(KeyError):
+            solution.boxes[1]
+
+    def test_compact_solution_integer_should_store_weights_and_loads_as_ints(self):
+        solution = CompactSolution(5, 2, integer=True)
+        solution.create_box()
+        solution.add_object(0, 3, 0)
+        self.assertEqual('q', solution.weights.typecode)
+        self.assertEqual('q', solution.loads.typecode)
+        self.assertEqual(2, solution.amount_space_available_box(0))
+
+    def test_generate_solution_compact_should_be_equal_to_generate_solution(self):
+        instance =  Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        for constructor_class in [FirstFitConstructor, BestFitConstructor,
+                                  TreeFirstFitConstructor, SortedBestFitConstructor]:
+            expected = constructor_class(instance).generate_solution()
+            solution = constructor_class(instance, compact=True).generate_solution()
+            self.assertIsInstance(solution, CompactSolution)
+            self.assertEqual(expected.boxes, solution.boxes)
+
         
 class FirstFitConstructorTest(unittest.TestCase):
     def test_find_box_that_fits_5_with_empty_solution_should_return_box_0(self):
@@ -209,8 +338,8 @@ class FirstFitConstructorTest(unittest.TestCase):
     def test_find_box_that_fits_20_with_one_full_box_should_return_box_1(self):
         instance =  Instance("inst_name", 20, [5, 10, 15, 20], 3)
         solution = Solution(10, 4)
-        solution.boxes[0] = [0, 1, 2]
-        solution.weights = [5, 10, 15, 20]
+        solution.create_box()
+        solution.add_object(0, 10, 0)
         constructor = FirstFitConstructor(instance)
         self.assertEqual(1, constructor._find_box_that_fits(5, solution))
         
@@ -232,10 +361,76 @@ class FirstFitConstructorTest(unittest.TestCase):
 
 
 class DescendingFirstFitConstructorTest(unittest.TestCase):
-    def test_get_objects_in_order_should_return_ordered_list(self):
+    def test_get_order_should_return_positions_by_decreasing_weight(self):
         instance =  Instance("inst_name", 10, [6, 10, 4, 5], 3)
         constructor = DescendingFirstFitConstructor(instance)
-        self.assertEqual([8, 5, 3, 1], constructor._get_objects_in_order([8, 1, 5, 3]))
+        self.assertEqual([0, 2, 3, 1], constructor._get_order([8, 1, 5, 3]))
+
+    def test_generate_solution_should_record_positions_of_the_instance(self):
+        instance =  Instance("inst_name", 10, [4, 6, 5, 5], 2)
+        solution = DescendingFirstFitConstructor(instance).generate_solution()
+        self.assertEqual([4, 6, 5, 5], solution.weights)
+        self.assertEqual([1, 0], solution.boxes[0])
+        self.assertEqual([2, 3], solution.boxes[1])
+
+
+class TreeFirstFitConstructorTest(unittest.TestCase):
+    def test_generate_solution_valid_should_return_a_solution(self):
+        instance =  Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        constructor = TreeFirstFitConstructor(instance)
+        solution = constructor.generate_solution()
+        self.assertEqual(3, len(solution.boxes))
+        self.assertEqual([0, 2], solution.boxes[0])
+        self.assertEqual([1], solution.boxes[1])
+        self.assertEqual([3], solution.boxes[2])
+
+    def test_generate_solution_should_be_equal_to_first_fit(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack1.txt"))
+        for instance in instances[:3]:
+            expected = FirstFitConstructor(instance).generate_solution()
+            solution = TreeFirstFitConstructor(instance).generate_solution()
+            self.assertEqual(expected.boxes, solution.boxes)
+
+    def test_generate_solution_descending_should_be_equal_to_descending_first_fit(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack5.txt"))
+        for instance in instances[:3]:
+            expected = DescendingFirstFitConstructor(instance).generate_solution()
+            solution = DescendingTreeFirstFitConstructor(instance).generate_solution()
+            self.assertEqual(expected.boxes, solution.boxes)
+
+    def test_generate_solution_with_weight_bigger_than_box_capacity_should_raise_error(self):
+        instance =  Instance("inst_name", 5, [6, 10, 4, 5], 3)
+        constructor = TreeFirstFitConstructor(instance)
+        with self.assertRaises(ValueError):
+            solution = constructor.generate_solution()
+
+
+class ResidualTreeTest(unittest.TestCase):
+    def test_find_first_with_new_tree_should_return_box_0(self):
+        tree = ResidualTree(4, 10)
+        self.assertEqual(0, tree.find_first(10))
+
+    def test_find_first_with_weight_bigger_than_all_boxes_should_return_none(self):
+        tree = ResidualTree(4, 10)
+        self.assertIsNone(tree.find_first(11))
+
+    def test_find_first_should_return_leftmost_box_that_fits(self):
+        tree = ResidualTree(5, 10)
+        tree.update(0, 2)
+        tree.update(1, 6)
+        tree.update(2, 8)
+        self.assertEqual(1, tree.find_first(5))
+        self.assertEqual(2, tree.find_first(7))
+        self.assertEqual(3, tree.find_first(9))
+
+    def test_grow_should_keep_boxes_and_add_empty_ones(self):
+        tree = ResidualTree(2, 10)
+        tree.update(0, 3)
+        tree.update(1, 1)
+        tree.grow()
+        self.assertEqual(4, tree.leaves)
+        self.assertEqual(0, tree.find_first(2))
+        self.assertEqual(2, tree.find_first(4))
 
 
 class BestFitConstructorTest(unittest.TestCase):
@@ -248,18 +443,19 @@ class BestFitConstructorTest(unittest.TestCase):
     def test_find_box_that_fits_5_with_one_full_box_should_return_box_1(self):
         instance =  Instance("inst_name", 20, [5, 10, 15, 20], 3)
         solution = Solution(20, 4)
-        solution.boxes[0] = [3]
-        solution.weights = [5, 10, 15, 20]
+        solution.create_box()
+        solution.add_object(3, 20, 0)
         constructor = BestFitConstructor(instance)
         self.assertEqual(1, constructor._find_box_that_fits(5, solution))
         
     def test_find_box_that_fits_5_with_two_boxes_that_fits_should_return_fullst_box(self):
         instance =  Instance("inst_name", 20, [5, 10, 15, 20], 3)
         solution = Solution(20, 4)
-        solution.boxes[0] = [3]
-        solution.boxes[1] = [0]
-        solution.boxes[2] = [2]
-        solution.weights = [5, 10, 15, 20]
+        for box in range(3):
+            solution.create_box()
+        solution.add_object(3, 20, 0)
+        solution.add_object(0, 5, 1)
+        solution.add_object(2, 15, 2)
         constructor = BestFitConstructor(instance)
         self.assertEqual(2, constructor._find_box_that_fits(5, solution))
         
@@ -280,7 +476,262 @@ class BestFitConstructorTest(unittest.TestCase):
 
 
 class DescendingBestFitConstructorTest(unittest.TestCase):
-    def test_get_objects_in_order_should_return_ordered_list(self):
+    def test_get_order_should_return_positions_by_decreasing_weight(self):
         instance =  Instance("inst_name", 10, [6, 10, 4, 5], 3)
         constructor = DescendingBestFitConstructor(instance)
-        self.assertEqual([8, 5, 3, 1], constructor._get_objects_in_order([8, 1, 5, 3]))
+        self.assertEqual([0, 2, 3, 1], constructor._get_order([8, 1, 5, 3]))
+
+    def test_generate_solution_should_record_positions_of_the_instance(self):
+        instance =  Instance("inst_name", 10, [4, 6, 5, 5], 2)
+        solution = DescendingBestFitConstructor(instance).generate_solution()
+        self.assertEqual([4, 6, 5, 5], solution.weights)
+        self.assertEqual([1, 0], solution.boxes[0])
+        self.assertEqual([2, 3], solution.boxes[1])
+
+
+class SortedBestFitConstructorTest(unittest.TestCase):
+    def test_generate_solution_valid_should_return_a_solution(self):
+        instance =  Instance("inst_name", 10, [5, 6, 4, 5], 2)
+        constructor = SortedBestFitConstructor(instance)
+        solution = constructor.generate_solution()
+        self.assertEqual(2, len(solution.boxes))
+        self.assertEqual([0, 3], solution.boxes[0])
+        self.assertEqual([1, 2], solution.boxes[1])
+
+    def test_generate_solution_should_be_equal_to_best_fit(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack1.txt"))
+        for instance in instances[:3]:
+            expected = BestFitConstructor(instance).generate_solution()
+            solution = SortedBestFitConstructor(instance).generate_solution()
+            self.assertEqual(expected.boxes, solution.boxes)
+
+    def test_generate_solution_descending_should_be_equal_to_descending_best_fit(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack5.txt"))
+        for instance in instances[:3]:
+            expected = DescendingBestFitConstructor(instance).generate_solution()
+            solution = DescendingSortedBestFitConstructor(instance).generate_solution()
+            self.assertEqual(expected.boxes, solution.boxes)
+
+    def test_generate_solution_with_weight_bigger_than_box_capacity_should_raise_error(self):
+        instance =  Instance("inst_name", 5, [6, 10, 4, 5], 3)
+        constructor = SortedBestFitConstructor(instance)
+        with self.assertRaises(ValueError):
+            solution = constructor.generate_solution()
+
+
+class ResidualIndexTest(unittest.TestCase):
+    def test_find_best_with_empty_index_should_return_none(self):
+        index = ResidualIndex()
+        self.assertIsNone(index.find_best(1))
+
+    def test_find_best_should_return_fullest_box_that_fits(self):
+        index = ResidualIndex()
+        index.update(0, 8)
+        index.update(1, 3)
+        index.update(2, 5)
+        self.assertEqual(2, index.find_best(4))
+        self.assertEqual(1, index.find_best(3))
+
+    def test_find_best_with_tied_boxes_should_return_lowest_box_number(self):
+        index = ResidualIndex()
+        index.update(2, 5)
+        index.update(1, 5)
+        self.assertEqual(1, index.find_best(5))
+
+    def test_update_should_replace_the_old_space_of_the_box(self):
+        index = ResidualIndex()
+        index.update(0, 8)
+        index.update(0, 2)
+        self.assertEqual([(2, 0)], index.entries)
+        self.assertIsNone(index.find_best(3))
+
+    def test_remove_should_remove_box_from_index(self):
+        index = ResidualIndex()
+        index.update(0, 8)
+        index.update(1, 5)
+        index.remove(1)
+        self.assertEqual([(8, 0)], index.entries)
+        self.assertEqual(0, index.find_best(5))
+
+
+class BucketBestFitConstructorTest(unittest.TestCase):
+    def test_generate_solution_valid_should_return_a_solution(self):
+        instance =  Instance("inst_name", 10, [5, 6, 4, 5], 2)
+        constructor = BucketBestFitConstructor(instance)
+        solution = constructor.generate_solution()
+        self.assertEqual(2, len(solution.boxes))
+        self.assertEqual([0, 3], solution.boxes[0])
+        self.assertEqual([1, 2], solution.boxes[1])
+
+    def test_generate_solution_with_float_instance_should_raise_error(self):
+        instance =  Instance("inst_name", 10.0, [5.5, 6, 4, 5], 2)
+        constructor = BucketBestFitConstructor(instance)
+        with self.assertRaises(ValueError):
+            solution = constructor.generate_solution()
+
+    def test_generate_solution_should_be_equal_to_best_fit(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack1.txt"))
+        for instance in instances[:3]:
+            expected = BestFitConstructor(instance).generate_solution()
+            solution = BucketBestFitConstructor(instance).generate_solution()
+            self.assertEqual(expected.boxes, solution.boxes)
+
+    def test_generate_solution_descending_should_be_equal_to_descending_best_fit(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack2.txt"))
+        for instance in instances[:3]:
+            expected = DescendingBestFitConstructor(instance).generate_solution()
+            solution = DescendingBucketBestFitConstructor(instance).generate_solution()
+            self.assertEqual(expected.boxes, solution.boxes)
+
+
+class ResidualBucketsTest(unittest.TestCase):
+    def test_find_best_with_empty_index_should_return_none(self):
+        index = ResidualBuckets()
+        self.assertIsNone(index.find_best(1))
+
+    def test_find_best_should_return_fullest_box_that_fits(self):
+        index = ResidualBuckets()
+        index.update(0, 8)
+        index.update(1, 3)
+        index.update(2, 5)
+        self.assertEqual(2, index.find_best(4))
+        self.assertEqual(1, index.find_best(3))
+        self.assertIsNone(index.find_best(9))
+
+    def test_find_best_with_tied_boxes_should_return_lowest_box_number(self):
+        index = ResidualBuckets()
+        index.update(2, 5)
+        index.update(1, 5)
+        index.update(0, 7)
+        index.update(0, 5)
+        self.assertEqual(0, index.find_best(5))
+        index.update(0, 1)
+        self.assertEqual(1, index.find_best(5))
+
+    def test_remove_should_clear_empty_bucket(self):
+        index = ResidualBuckets()
+        index.update(0, 8)
+        index.remove(0)
+        self.assertEqual(0, index.bits)
+        self.assertIsNone(index.find_best(1))
+
+
+class NextFitConstructorTest(unittest.TestCase):
+    def test_generate_solution_should_close_box_when_object_does_not_fit(self):
+        instance =  Instance("inst_name", 10, [6, 5, 4, 5], 3)
+        solution = NextFitConstructor(instance).generate_solution()
+        self.assertEqual({0: [0], 1: [1, 2], 2: [3]}, solution.boxes)
+
+    def test_generate_solution_should_pass_closed_boxes_to_on_close(self):
+        instance =  Instance("inst_name", 10, [6, 5, 4, 5], 3)
+        closed = []
+        NextFitConstructor(instance, on_close=lambda box, objs, load: closed.append((box, objs, load))).generate_solution()
+        self.assertEqual([(0, [0], 6), (1, [1, 2], 9), (2, [3], 5)], closed)
+
+    def test_generate_solution_with_compact_solution_should_pass_same_closed_boxes(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack1.txt"))
+        for constructor_class in (NextFitConstructor, HarmonicConstructor):
+            expected, closed = [], []
+            constructor_class(instances[0], on_close=lambda box, objs, load: expected.append((box, list(objs), load))).generate_solution()
+            constructor_class(instances[0], compact=True, profile=Profile(),
+                              on_close=lambda box, objs, load: closed.append((box, list(objs), load))).generate_solution()
+            self.assertEqual(expected, closed)
+
+    def test_stream_boxes_should_keep_only_open_boxes(self):
+        instance =  Instance("inst_name", 10, [6, 5, 4, 5], 3)
+        constructor = NextFitConstructor(instance)
+        boxes = constructor.stream_boxes()
+        self.assertEqual((0, [0], 6), next(boxes))
+        self.assertEqual([1], constructor.open_boxes)
+        self.assertEqual([(1, [1, 2], 9), (2, [3], 5)], list(boxes))
+
+
+class NextKFitConstructorTest(unittest.TestCase):
+    def test_next_k_fit_constructor_with_invalid_k_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            NextKFitConstructor(Instance("inst_name", 10, [6], 1), 0)
+
+    def test_generate_solution_should_use_first_of_the_open_boxes(self):
+        instance =  Instance("inst_name", 10, [6, 7, 4, 8, 3, 5], 3)
+        solution = NextKFitConstructor(instance, 2).generate_solution()
+        self.assertEqual({0: [0, 2], 1: [1, 4], 2: [3], 3: [5]}, solution.boxes)
+
+    def test_generate_solution_with_k_as_large_as_boxes_should_be_equal_to_first_fit(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack1.txt"))
+        for instance in instances[:3]:
+            expected = FirstFitConstructor(instance).generate_solution()
+            solution = NextKFitConstructor(instance, len(instance.objects)).generate_solution()
+            self.assertEqual(expected.boxes, solution.boxes)
+
+    def test_stream_boxes_should_return_same_boxes_as_generate_solution(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack5.txt"))
+        for instance in instances[:3]:
+            expected = NextKFitConstructor(instance, 3).generate_solution()
+            streamed = dict((box, objs) for box, objs, load in NextKFitConstructor(instance, 3).stream_boxes())
+            self.assertEqual(expected.boxes, streamed)
+
+
+class HarmonicConstructorTest(unittest.TestCase):
+    def test_generate_solution_should_pack_each_class_apart(self):
+        instance =  Instance("inst_name", 12, [7, 5, 2, 5, 2, 7, 5], 4)
+        solution = HarmonicConstructor(instance, 3).generate_solution()
+        self.assertEqual({0: [0], 1: [1, 3], 2: [2, 4], 3: [5], 4: [6]}, solution.boxes)
+
+    def test_generate_solution_with_float_instance_should_use_classes_of_capacity(self):
+        instance =  Instance("inst_name", 1.0, [0.5, 0.3, 0.5, 0.3, 0.3, 0.3], 3)
+        solution = HarmonicConstructor(instance, 3).generate_solution()
+        self.assertEqual({0: [0, 2], 1: [1, 3, 4], 2: [5]}, solution.boxes)
+
+    def test_stream_boxes_should_return_same_boxes_as_generate_solution(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(os.curdir, "instances", "binpack1.txt"))
+        for instance in instances[:3]:
+            expected = HarmonicConstructor(instance).generate_solution()
+            streamed = dict((box, objs) for box, objs, load in HarmonicConstructor(instance).stream_boxes())
+            self.assertEqual(expected.boxes, streamed)
+
+
+class ProfileTest(unittest.TestCase):
+    def test_profile_should_start_with_zero_counters(self):
+        profile = Profile()
+        self.assertEqual({"solutions": 0, "objects": 0, "boxes_scanned": 0, "space_queries": 0,
+                          "boxes_created": 0, "timings": {}}, profile.to_dict())
+
+    def test_add_time_should_sum_times_of_a_phase(self):
+        profile = Profile()
+        profile.add_time("sort", 1.5)
+        profile.add_time("sort", 0.5)
+        self.assertEqual({"sort": 2.0}, profile.timings)
+
+    def test_generate_solution_with_profile_should_count_operations(self):
+        instance =  Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        profile = Profile()
+        solution = FirstFitConstructor(instance, profile=profile).generate_solution()
+        self.assertIsInstance(solution, ProfiledSolution)
+        self.assertEqual(1, profile.solutions)
+        self.assertEqual(4, profile.objects)
+        self.assertEqual(3, profile.boxes_created)
+        self.assertEqual(4, profile.boxes_scanned)
+        self.assertEqual(8, profile.space_queries)
+        self.assertEqual(set(["sort", "index", "search", "add"]), set(profile.timings))
+
+    def test_generate_solution_with_profile_should_count_index_steps_as_boxes_scanned(self):
+        instance =  Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        for constructor_class in [TreeFirstFitConstructor, SortedBestFitConstructor, BucketBestFitConstructor]:
+            profile = Profile()
+            constructor_class(instance, profile=profile).generate_solution()
+            self.assertGreater(profile.boxes_scanned, 0)
+        profile = Profile()
+        TreeFirstFitConstructor(instance, profile=profile).generate_solution()
+        self.assertEqual(4 * 3, profile.boxes_scanned)
+
+    def test_generate_solution_with_profile_should_be_equal_to_generate_solution(self):
+        instance =  Instance("inst_name", 10, [5, 6, 4, 5], 2)
+        for compact in [False, True]:
+            expected = BestFitConstructor(instance, compact=compact).generate_solution()
+            solution = BestFitConstructor(instance, compact=compact, profile=Profile()).generate_solution()
+            self.assertEqual(expected.boxes, solution.boxes)
+
+    def test_generate_solution_compact_with_profile_should_return_profiled_compact_solution(self):
+        instance =  Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        solution = TreeFirstFitConstructor(instance, compact=True, profile=Profile()).generate_solution()
+        self.assertIsInstance(solution, ProfiledCompactSolution)
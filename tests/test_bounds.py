@@ -0,0 +1,40 @@
+import unittest
+import os
+from binp import *
+from bounds import *
+
+INSTANCE_DIR = os.path.join(os.curdir, "instances")
+
+class BoundsTest(unittest.TestCase):
+    def test_continuous_bound_should_round_up_total_weight(self):
+        self.assertEqual(2, continuous_bound([6, 10, 4], 10))
+        self.assertEqual(3, continuous_bound([6, 10, 4, 5], 10))
+
+    def test_continuous_bound_with_float_weights_should_ignore_rounding_errors(self):
+        self.assertEqual(1, continuous_bound([0.1] * 10, 1.0))
+
+    def test_martello_toth_bound_with_big_objects_should_count_one_box_each(self):
+        self.assertEqual(3, martello_toth_bound([6, 6, 6], 10))
+
+    def test_martello_toth_bound_should_be_better_than_continuous_bound(self):
+        objects = [6, 6, 6, 5, 5]
+        self.assertEqual(3, continuous_bound(objects, 10))
+        self.assertEqual(4, martello_toth_bound(objects, 10))
+
+    def test_lower_bound_should_not_be_above_best_known_solution(self):
+        for instance_file in ["binpack1.txt", "binpack5.txt"]:
+            instances = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, instance_file))
+            for instance in instances:
+                self.assertTrue(lower_bound(instance) <= instance.best_known_sol)
+
+    def test_is_optimal_with_solution_at_the_bound_should_return_true(self):
+        instance = Instance("inst_name", 10, [5, 6, 4, 5], 2)
+        solution = BestFitConstructor(instance).generate_solution()
+        self.assertTrue(is_optimal(solution, instance))
+
+    def test_is_optimal_with_solution_above_the_bound_should_return_false(self):
+        instance = Instance("inst_name", 10, [6, 10, 4, 5], 3)
+        solution = Solution(10, 4)
+        for obj, weight in enumerate(instance.objects):
+            solution.add_object(obj, weight, solution.create_box())
+        self.assertFalse(is_optimal(solution, instance))
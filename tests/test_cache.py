@@ -0,0 +1,51 @@
+import unittest
+from binp import *
+from cache import *
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResultCache(":memory:", max_entries=2, version="v1")
+        self.instance = Instance("inst_name", 10, [6, 10, 4, 5], 3)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_result_cache_with_invalid_size_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            ResultCache(":memory:", max_entries=0)
+
+    def test_get_with_empty_cache_should_return_none(self):
+        self.assertIsNone(self.cache.get(self.instance, "FirstFitConstructor"))
+
+    def test_get_should_return_stored_result(self):
+        self.cache.put(self.instance, "FirstFitConstructor", 3, "0.01")
+        self.assertEqual((3, "0.01"), self.cache.get(self.instance, "FirstFitConstructor"))
+        self.assertIsNone(self.cache.get(self.instance, "BestFitConstructor"))
+
+    def test_get_with_same_objects_in_other_instance_should_return_stored_result(self):
+        self.cache.put(self.instance, "FirstFitConstructor", 3, "0.01")
+        other = Instance("other_name", 10, [6, 10, 4, 5], 0)
+        self.assertEqual((3, "0.01"), self.cache.get(other, "FirstFitConstructor"))
+
+    def test_get_with_objects_in_other_order_should_return_none(self):
+        self.cache.put(self.instance, "FirstFitConstructor", 3, "0.01")
+        other = Instance("inst_name", 10, [10, 6, 4, 5], 3)
+        self.assertIsNone(self.cache.get(other, "FirstFitConstructor"))
+
+    def test_get_with_other_code_version_should_return_none(self):
+        self.cache.put(self.instance, "FirstFitConstructor", 3, "0.01")
+        self.cache.version = "v2"
+        self.assertIsNone(self.cache.get(self.instance, "FirstFitConstructor"))
+
+    def test_put_above_max_entries_should_evict_least_recently_used(self):
+        self.cache.put(self.instance, "FirstFitConstructor", 3, "0.01")
+        self.cache.put(self.instance, "BestFitConstructor", 3, "0.02")
+        self.cache.get(self.instance, "FirstFitConstructor")
+        self.cache.put(self.instance, "TreeFirstFitConstructor", 3, "0.03")
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNone(self.cache.get(self.instance, "BestFitConstructor"))
+        self.assertIsNotNone(self.cache.get(self.instance, "FirstFitConstructor"))
+
+    def test_code_version_should_be_a_hash_of_the_sources(self):
+        self.assertEqual(64, len(code_version()))
+        self.assertEqual(code_version(), code_version())
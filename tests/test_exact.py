@@ -0,0 +1,80 @@
+import unittest
+import os
+from binp import *
+from exact import *
+
+INSTANCE_DIR = os.path.join(os.curdir, "instances")
+
+class ExactSolverTest(unittest.TestCase):
+    def test_exact_solver_with_invalid_time_limit_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            ExactSolver(Instance("inst_name", 10, [5], 1), 0)
+
+    def test_solve_with_weight_bigger_than_box_capacity_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            ExactSolver(Instance("inst_name", 5, [6, 4], 2)).solve()
+
+    def test_solve_should_find_optimal_solution_better_than_best_fit_decreasing(self):
+        instance = Instance("inst_name", 10, [3, 4, 3, 3, 4, 3], 2)
+        self.assertEqual(3, len(DescendingBestFitConstructor(instance).generate_solution().boxes))
+        solver = ExactSolver(instance, 5.0)
+        solution = solver.solve()
+        self.assertTrue(solver.optimal)
+        self.assertEqual(2, len(solution.boxes))
+
+    def test_solve_should_return_objects_at_their_positions_in_the_instance(self):
+        instance = Instance("inst_name", 10, [3, 4, 3, 3, 4, 3], 2)
+        solution = ExactSolver(instance, 5.0).solve()
+        for box in solution.boxes:
+            self.assertEqual(10, sum(instance.objects[obj] for obj in solution.boxes[box]))
+        self.assertEqual([3, 4, 3, 3, 4, 3], solution.weights)
+
+    def test_search_should_prove_that_target_boxes_are_not_enough(self):
+        instance = Instance("inst_name", 10, [6, 6, 6, 5, 5], 4)
+        solver = ExactSolver(instance, 5.0)
+        found, completed = solver._search([0, 1, 2, 3, 4], instance.objects, 10, 3, float("inf"))
+        self.assertIsNone(found)
+        self.assertTrue(completed)
+
+    def test_search_should_find_packing_in_target_boxes(self):
+        solver = ExactSolver(Instance("inst_name", 10, [5, 5, 6, 4], 2))
+        found, completed = solver._search([2, 0, 1, 3], [5, 5, 6, 4], 10, 2, float("inf"))
+        self.assertEqual([[2, 3], [0, 1]], found)
+        self.assertTrue(completed)
+
+    def test_solve_with_float_weights_should_only_fill_boxes_that_solution_accepts(self):
+        instance = Instance("inst_name", 100.0, [49.1, 25.3, 25.6], 1)
+        solver = ExactSolver(instance, 5.0)
+        solution = solver.solve()
+        self.assertTrue(solver.optimal)
+        self.assertEqual(2, len(solution.boxes))
+        self.assertEqual(2, solver.bound)
+
+    def test_solve_with_or_library_instance_should_reach_best_known_solution(self):
+        instance = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack1.txt"))[0]
+        solution, optimal = solve_exact(instance, 10.0)
+        self.assertTrue(optimal)
+        self.assertEqual(instance.best_known_sol, len(solution.boxes))
+
+    def test_solve_with_larger_or_library_instance_should_prove_lower_bound(self):
+        instance = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack3.txt"))[1]
+        solver = ExactSolver(instance, 10.0)
+        solution = solver.solve()
+        self.assertTrue(solver.optimal)
+        self.assertEqual(instance.best_known_sol, len(solution.boxes))
+
+    def test_solve_with_short_time_limit_should_return_incumbent(self):
+        instance = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack5.txt"))[0]
+        solver = ExactSolver(instance, 0.05)
+        solution = solver.solve()
+        self.assertFalse(solver.optimal)
+        objects = sorted(obj for objs in solution.boxes.values() for obj in objs)
+        self.assertEqual(list(range(len(instance.objects))), objects)
+
+    def test_reduce_should_fix_boxes_of_objects_that_fit_only_one_other(self):
+        instance = Instance("inst_name", 10, [9, 7, 3, 2, 2], 3)
+        solver = ExactSolver(instance)
+        fixed, free = solver._reduce([0, 1, 2, 3, 4], instance.objects, 10)
+        self.assertEqual([[0]], fixed[:1])
+        self.assertEqual([1, 2], fixed[1])
+        self.assertEqual([3, 4], free)
@@ -0,0 +1,69 @@
+import unittest
+import os
+import csv
+import json
+import shutil
+import tempfile
+from binp import *
+from export import *
+from batch import BatchPacker
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.instances = [Instance("inst_1", 10, [4, 6, 5, 5], 2), Instance("inst_2", 10, [3, 9], 2)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_solution_assignment_should_return_box_of_each_object(self):
+        solution = DescendingFirstFitConstructor(self.instances[0]).generate_solution()
+        self.assertEqual([0, 0, 1, 1], list(solution_assignment(solution)))
+
+    def test_solution_assignment_with_compact_solution_should_return_box_of_each_object(self):
+        solution = DescendingFirstFitConstructor(self.instances[0], compact=True).generate_solution()
+        self.assertEqual([0, 0, 1, 1], list(solution_assignment(solution)))
+
+    def test_export_csv_should_write_one_row_per_object(self):
+        path = os.path.join(self.tmp_dir, "result.csv")
+        count = export_assignments(solution_results(self.instances, DescendingBestFitConstructor), path)
+        self.assertEqual(2, count)
+        with open(path, newline='') as result:
+            rows = list(csv.reader(result))
+        self.assertEqual(["instance", "object", "weight", "box"], rows[0])
+        self.assertEqual(["inst_1", "1", "6", "0"], rows[2])
+        self.assertEqual(["inst_2", "1", "9", "0"], rows[6])
+        self.assertEqual(7, len(rows))
+
+    def test_export_json_should_write_assignment_of_each_instance(self):
+        path = os.path.join(self.tmp_dir, "result.json")
+        export_assignments(solution_results(self.instances, DescendingBestFitConstructor), path)
+        with open(path) as result:
+            records = json.load(result)
+        self.assertEqual({"instance": "inst_1", "boxes": 2, "assignment": [0, 0, 1, 1]}, records[0])
+        self.assertEqual({"instance": "inst_2", "boxes": 2, "assignment": [1, 0]}, records[1])
+
+    def test_export_with_unknown_format_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            export_assignments([], os.path.join(self.tmp_dir, "result.txt"))
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_export_npz_should_write_concatenated_assignments(self):
+        path = os.path.join(self.tmp_dir, "result.npz")
+        export_assignments(solution_results(self.instances, DescendingBestFitConstructor), path)
+        with numpy.load(path) as result:
+            self.assertEqual(["inst_1", "inst_2"], list(result["names"]))
+            self.assertEqual([0, 4, 6], list(result["offsets"]))
+            self.assertEqual([0, 0, 1, 1, 1, 0], list(result["assignments"]))
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_batch_results_should_match_solution_results(self):
+        packer = BatchPacker(self.instances)
+        assignments, bin_counts = packer.pack("DescendingFirstFitConstructor")
+        expected = solution_results(self.instances, DescendingFirstFitConstructor)
+        for (instance, assignment), (_, solved) in zip(batch_results(packer, assignments), expected):
+            self.assertEqual(list(solved), list(assignment))
@@ -0,0 +1,68 @@
+import unittest
+import os
+from binp import *
+from localsearch import *
+
+INSTANCE_DIR = os.path.join(os.curdir, "instances")
+
+class LocalSearchTest(unittest.TestCase):
+    def test_local_search_with_invalid_time_limit_should_raise_valueerror(self):
+        solution = Solution(10, 1)
+        with self.assertRaises(ValueError):
+            LocalSearch(solution, 0)
+
+    def test_improve_should_empty_the_least_filled_box(self):
+        solution = Solution(10, 4)
+        for obj, weight in enumerate([5, 5, 4, 6]):
+            solution.add_object(obj, weight, solution.create_box())
+        improved = improve_solution(solution)
+        self.assertEqual(2, len(improved.boxes))
+        self.assertEqual([10, 10], [10 - improved.amount_space_available_box(box) for box in improved.boxes])
+
+    def test_swap_object_should_move_a_lighter_object_to_the_source_box(self):
+        solution = Solution(10, 5)
+        for obj in range(3):
+            solution.create_box()
+        for obj, weight, box in [(0, 5, 0), (1, 4, 0), (2, 6, 1), (3, 2, 1), (4, 3, 2)]:
+            solution.add_object(obj, weight, box)
+        search = LocalSearch(solution)
+        search._load_solution()
+        self.assertFalse(search._move_object(4, 2))
+        self.assertTrue(search._swap_object(4, 2))
+        self.assertEqual([[0, 1], [2, 4], [3]], search.items)
+        self.assertEqual([9, 9, 2], search.loads)
+
+    def test_improve_should_keep_every_object_and_capacity(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack5.txt"))
+        for instance in instances[:3]:
+            solution = FirstFitConstructor(instance).generate_solution()
+            improved = improve_solution(solution, 0.5)
+            objects = sorted(obj for objs in improved.boxes.values() for obj in objs)
+            self.assertEqual(list(range(len(instance.objects))), objects)
+            self.assertTrue(len(improved.boxes) <= len(solution.boxes))
+            for box in improved.boxes:
+                self.assertTrue(improved.amount_space_available_box(box) >= 0)
+
+    def test_improve_with_compact_solution_should_return_compact_solution(self):
+        instance = Instance("inst_name", 10, [5, 5, 4, 6], 2)
+        solution = FirstFitConstructor(instance, compact=True).generate_solution()
+        improved = improve_solution(solution)
+        self.assertIsInstance(improved, CompactSolution)
+        self.assertEqual(2, len(improved.boxes))
+
+    def test_improve_with_profiled_solution_should_return_a_solution(self):
+        instance = Instance("inst_name", 10, [5, 5, 4, 6], 2)
+        for compact in (False, True):
+            profile = Profile()
+            solution = FirstFitConstructor(instance, compact, profile).generate_solution()
+            improved = improve_solution(solution, 0.1)
+            self.assertEqual(2, len(improved.boxes))
+            self.assertEqual(1, profile.solutions)
+
+    def test_improve_with_integer_compact_solution_should_keep_integer_weights(self):
+        instance = Instance("inst_name", 10, [5, 5, 4, 6], 2)
+        solution = FirstFitConstructor(instance, compact=True).generate_solution()
+        improved = improve_solution(solution, 0.1)
+        self.assertEqual('q', improved.weights.typecode)
+        self.assertEqual('q', improved.loads.typecode)
+        self.assertEqual(10, improved.box_size)
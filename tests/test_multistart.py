@@ -0,0 +1,77 @@
+import unittest
+import os
+from binp import *
+from multistart import *
+
+INSTANCE_DIR = os.path.join(os.curdir, "instances")
+
+class RandomizedBestFitConstructorTest(unittest.TestCase):
+    def setUp(self):
+        self.instance = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack1.txt"))[0]
+
+    def test_generate_solution_with_same_seed_should_return_same_solution(self):
+        first = RandomizedBestFitConstructor(self.instance, 7, 0.2, 0.2, 0.01).generate_solution()
+        second = RandomizedBestFitConstructor(self.instance, 7, 0.2, 0.2, 0.01).generate_solution()
+        self.assertEqual(first.boxes, second.boxes)
+        self.assertEqual(first.weights, second.weights)
+
+    def test_generate_solution_should_pack_every_object(self):
+        solution = RandomizedBestFitConstructor(self.instance, 3, 0.2, 0.2, 0.01).generate_solution()
+        self.assertEqual(sorted(self.instance.objects), sorted(solution.weights))
+        objects = sorted(obj for objs in solution.boxes.values() for obj in objs)
+        self.assertEqual(list(range(len(self.instance.objects))), objects)
+
+    def test_generate_solution_without_noise_should_use_as_many_boxes_as_best_fit_decreasing(self):
+        solution = RandomizedBestFitConstructor(self.instance, 5, 0, 0, 0).generate_solution()
+        expected = DescendingBestFitConstructor(self.instance).generate_solution()
+        self.assertEqual(list(self.instance.objects), solution.weights)
+        self.assertEqual(len(expected.boxes), len(solution.boxes))
+
+    def test_randomized_constructor_with_negative_noise_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            RandomizedBestFitConstructor(self.instance, 1, -0.1)
+
+
+class MultiStartSolverTest(unittest.TestCase):
+    def setUp(self):
+        self.instance = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack5.txt"))[0]
+
+    def test_multistart_solver_with_no_starts_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            MultiStartSolver(self.instance, 0)
+
+    def test_solve_should_not_be_worse_than_best_fit_decreasing(self):
+        expected = DescendingBestFitConstructor(self.instance).generate_solution()
+        solver = MultiStartSolver(self.instance, 8, seed=1)
+        solution = solver.solve()
+        self.assertLessEqual(len(solution.boxes), len(expected.boxes))
+        self.assertEqual(8, solver.starts_run)
+
+    def test_solve_should_stop_when_lower_bound_is_reached(self):
+        instance = Instance("inst_name", 10, [6, 4, 5, 5], 2)
+        solver = MultiStartSolver(instance, 8, seed=1)
+        solution = solver.solve()
+        self.assertEqual(2, len(solution.boxes))
+        self.assertEqual(1, solver.starts_run)
+        self.assertEqual(0, solver.best_start)
+
+    def test_solve_with_workers_should_return_same_solution_as_serial(self):
+        serial = MultiStartSolver(self.instance, 4, 1, seed=11)
+        parallel = MultiStartSolver(self.instance, 4, 2, seed=11)
+        self.assertEqual(serial.solve().boxes, parallel.solve().boxes)
+        self.assertEqual(serial.best_start, parallel.best_start)
+
+    def test_solve_with_workers_should_stop_at_the_same_start_as_serial(self):
+        instance = Instance("inst_name", 150, [65, 93, 25, 65, 73, 27, 80, 56, 91, 28, 83, 45], 0)
+        serial = MultiStartSolver(instance, 8, 1, seed=3)
+        parallel = MultiStartSolver(instance, 8, 2, seed=3)
+        self.assertEqual(serial.solve().boxes, parallel.solve().boxes)
+        self.assertEqual((4, 5), (serial.best_start, serial.starts_run))
+        self.assertEqual((4, 5), (parallel.best_start, parallel.starts_run))
+
+    def test_solve_without_seed_should_record_the_seed_used(self):
+        solver = MultiStartSolver(self.instance, 2)
+        solution = solver.solve()
+        self.assertIsNotNone(solver.seed)
+        repeated = MultiStartSolver(self.instance, 2, seed=solver.seed).solve()
+        self.assertEqual(solution.boxes, repeated.boxes)
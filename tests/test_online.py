@@ -0,0 +1,112 @@
+import unittest
+import os
+from binp import *
+from online import *
+
+INSTANCE_DIR = os.path.join(os.curdir, "instances")
+
+class OnlinePackerTest(unittest.TestCase):
+    def test_online_packer_with_invalid_capacity_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            OnlineFirstFit(0)
+
+    def test_push_with_size_bigger_than_capacity_should_raise_valueerror(self):
+        packer = OnlineFirstFit(10)
+        with self.assertRaises(ValueError):
+            packer.push("a", 11)
+
+    def test_push_with_invalid_size_should_raise_valueerror(self):
+        packer = OnlineBestFit(10)
+        with self.assertRaises(ValueError):
+            packer.push("a", 0)
+
+    def test_close_box_should_emit_event_and_forget_the_box(self):
+        closed = []
+        packer = OnlineFirstFit(10, on_close=lambda box, objs, load: closed.append((box, objs, load)))
+        packer.push("a", 6)
+        packer.push("b", 3)
+        self.assertEqual(["a", "b"], packer.close_box(0))
+        self.assertEqual([(0, ["a", "b"], 9)], closed)
+        self.assertEqual({}, packer.boxes)
+        self.assertEqual(1, packer.push("c", 1))
+
+    def test_close_box_with_box_not_open_should_raise_valueerror(self):
+        packer = OnlineBestFit(10)
+        with self.assertRaises(ValueError):
+            packer.close_box(0)
+
+    def test_push_should_close_box_with_space_below_close_below(self):
+        closed = []
+        packer = OnlineBestFit(10, on_close=lambda box, objs, load: closed.append(box), close_below=2)
+        packer.push("a", 5)
+        packer.push("b", 4)
+        self.assertEqual([0], closed)
+        self.assertEqual(1, packer.push("c", 1))
+
+    def test_flush_should_close_every_open_box_in_order(self):
+        closed = []
+        packer = OnlineFirstFit(10, on_close=lambda box, objs, load: closed.append(box))
+        for item_id, size in enumerate([6, 10, 4, 5]):
+            packer.push(item_id, size)
+        self.assertEqual(3, packer.flush())
+        self.assertEqual([0, 1, 2], closed)
+        self.assertEqual(0, packer.flush())
+
+
+class OnlineFirstFitTest(unittest.TestCase):
+    def test_push_should_return_boxes_of_first_fit(self):
+        packer = OnlineFirstFit(10)
+        boxes = [packer.push(item_id, size) for item_id, size in enumerate([6, 10, 4, 5])]
+        self.assertEqual([0, 1, 0, 2], boxes)
+
+    def test_push_should_grow_beyond_initial_tree(self):
+        packer = OnlineFirstFit(10)
+        boxes = [packer.push(item_id, 10) for item_id in range(200)]
+        self.assertEqual(list(range(200)), boxes)
+
+    def test_close_box_should_keep_tree_size_bounded_by_open_boxes(self):
+        packer = OnlineFirstFit(10)
+        leaves = set()
+        for item_id in range(10000):
+            box = packer.push(item_id, 6)
+            if item_id >= 20:
+                packer.close_box(box - 20)
+            leaves.add(packer.tree.leaves)
+        self.assertEqual(20, len(packer.boxes))
+        self.assertEqual({64}, leaves)
+
+    def test_push_after_rebuild_should_use_first_open_box(self):
+        packer = OnlineFirstFit(10)
+        for item_id in range(200):
+            packer.push(item_id, 6)
+        for box in range(200):
+            if box not in (150, 120, 199):
+                packer.close_box(box)
+        self.assertEqual(120, packer.push("a", 4))
+        self.assertEqual(150, packer.push("b", 4))
+        self.assertEqual(200, packer.push("c", 5))
+
+    def test_push_should_be_equal_to_first_fit_constructor(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack2.txt"))
+        for instance in instances[:3]:
+            expected = FirstFitConstructor(instance).generate_solution()
+            packer = OnlineFirstFit(instance.bin_capacity)
+            for item_id, size in enumerate(instance.objects):
+                packer.push(item_id, size)
+            self.assertEqual(expected.boxes, packer.boxes)
+
+
+class OnlineBestFitTest(unittest.TestCase):
+    def test_push_should_return_boxes_of_best_fit(self):
+        packer = OnlineBestFit(10)
+        boxes = [packer.push(item_id, size) for item_id, size in enumerate([5, 6, 4, 5])]
+        self.assertEqual([0, 1, 1, 0], boxes)
+
+    def test_push_should_be_equal_to_best_fit_constructor(self):
+        instances = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack6.txt"))
+        for instance in instances[:3]:
+            expected = BestFitConstructor(instance).generate_solution()
+            packer = OnlineBestFit(instance.bin_capacity)
+            for item_id, size in enumerate(instance.objects):
+                packer.push(item_id, size)
+            self.assertEqual(expected.boxes, packer.boxes)
@@ -0,0 +1,74 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+import contextlib
+import run_instances
+from binp import *
+from run_instances import *
+
+INSTANCE_DIR = os.path.join(os.curdir, "instances")
+DATA_DIR = os.path.join(os.curdir, "tests", "data")
+
+def result_lines(output):
+    """The printed lines without the time column."""
+    return [line.split("\t")[:3] for line in output.getvalue().splitlines()]
+
+class RunAlgorithmTest(unittest.TestCase):
+    def setUp(self):
+        self.instances = ORLibraryInstanceReader.get_instances(os.path.join(INSTANCE_DIR, "binpack1.txt"))[:2]
+
+    def test_run_algorithm_with_profile_and_local_search_should_print_results(self):
+        output = io.StringIO()
+        profile = Profile()
+        with contextlib.redirect_stdout(output):
+            run_algorithm("FirstFitConstructor", self.instances, local_search=0.05, profile=profile)
+        lines = result_lines(output)
+        self.assertEqual(["FirstFitConstructor"], lines[0])
+        self.assertEqual(3, len(lines))
+        self.assertEqual(["u120_00", "48"], [lines[1][0], lines[1][2]])
+        self.assertEqual(2, profile.solutions)
+
+
+class ParallelExperimentTest(unittest.TestCase):
+    def setUp(self):
+        self.saved = (run_instances.INSTANCE_PATH, run_instances.INSTANCE_FILES,
+                      run_instances.CONSTRUCTOR_ALGORITHMS)
+        run_instances.INSTANCE_PATH = DATA_DIR
+        run_instances.INSTANCE_FILES = ["inst2.txt", "inst3.txt"]
+        run_instances.CONSTRUCTOR_ALGORITHMS = ["FirstFitConstructor", "DescendingBestFitConstructor",
+                                                "NextFitConstructor"]
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        (run_instances.INSTANCE_PATH, run_instances.INSTANCE_FILES,
+         run_instances.CONSTRUCTOR_ALGORITHMS) = self.saved
+        shutil.rmtree(self.tmp_dir)
+
+    def run_experiment(self, experiment, *args):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            experiment(*args)
+        return output
+
+    def test_execute_exp_parallel_should_print_same_results_as_execute_exp(self):
+        expected = result_lines(self.run_experiment(execute_exp))
+        parallel = result_lines(self.run_experiment(execute_exp_parallel, 2))
+        self.assertEqual(3 * (1 + 2) + 3 * (1 + 1), len(expected))
+        self.assertEqual(expected, parallel)
+
+    def test_execute_exp_parallel_should_merge_cached_results_in_order(self):
+        cache = ResultCache(os.path.join(self.tmp_dir, "cache.db"), version="test")
+        instance = ORLibraryInstanceReader.get_instances(os.path.join(DATA_DIR, "inst2.txt"))[1]
+        cache.put(instance, "DescendingBestFitConstructor", 99, "9.99")
+        expected = self.run_experiment(execute_exp).getvalue().splitlines()
+        parallel = self.run_experiment(execute_exp_parallel, 2, None, cache).getvalue().splitlines()
+        cached_line = (1 + 2) + 1 + 1
+        self.assertEqual("{0}\t99\t{1}\t9.99".format(instance.instance_name, instance.best_known_sol),
+                         parallel[cached_line])
+        del expected[cached_line], parallel[cached_line]
+        self.assertEqual([line.split("\t")[:3] for line in expected],
+                         [line.split("\t")[:3] for line in parallel])
+        self.assertEqual(3 * 3, len(cache))
+        cache.close()
@@ -0,0 +1,167 @@
+import unittest
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from binp import *
+from service import *
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+class PackingServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(2)
+        self.instance = Instance("inst_name", 10, [4, 6, 5, 5], 2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_packing_service_with_invalid_batch_size_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            PackingService(max_batch=0)
+
+    def test_pack_should_return_boxes_and_assignment(self):
+        async def scenario():
+            async with PackingService(1, executor=self.executor) as service:
+                return await service.pack(self.instance, "DescendingFirstFitConstructor")
+        self.assertEqual({"boxes": 2, "assignment": [0, 0, 1, 1]}, run(scenario()))
+
+    def test_pack_with_unknown_algorithm_should_raise_valueerror(self):
+        async def scenario():
+            async with PackingService(1, executor=self.executor) as service:
+                await service.pack(self.instance, "Unknown")
+        with self.assertRaises(ValueError):
+            run(scenario())
+
+    def test_pack_with_constructor_from_another_module_should_raise_valueerror(self):
+        import multistart
+        async def scenario():
+            async with PackingService(1, executor=self.executor) as service:
+                await service.pack(self.instance, "RandomizedBestFitConstructor")
+        with self.assertRaises(ValueError):
+            run(scenario())
+        self.assertNotIn("RandomizedBestFitConstructor", CONSTRUCTORS)
+
+    def test_pack_with_object_bigger_than_capacity_should_raise_valueerror(self):
+        async def scenario():
+            async with PackingService(1, executor=self.executor) as service:
+                return await asyncio.gather(service.pack(self.instance),
+                                            service.pack(Instance("inst_name", 5, [6], 1)),
+                                            return_exceptions=True)
+        valid, invalid = run(scenario())
+        self.assertEqual(2, valid["boxes"])
+        self.assertIsInstance(invalid, ValueError)
+
+    def test_pack_with_invalid_timeout_should_raise_valueerror_without_queueing(self):
+        async def scenario():
+            async with PackingService(1, executor=self.executor) as service:
+                for timeout in ("x", 0, -1):
+                    with self.assertRaises(ValueError):
+                        await service.pack(self.instance, timeout=timeout)
+                return service.queue.qsize(), service.batches
+        self.assertEqual((0, 0), run(scenario()))
+
+    def test_pack_should_coalesce_concurrent_requests_into_batches(self):
+        async def scenario():
+            async with PackingService(1, max_batch=10, max_delay=0.05, executor=self.executor) as service:
+                results = await asyncio.gather(*[service.pack(self.instance) for idx in range(20)])
+                return results, service.batches
+        results, batches = run(scenario())
+        self.assertEqual(20, len(results))
+        self.assertEqual(2, batches)
+
+    def test_pack_should_time_out_when_workers_are_busy(self):
+        async def scenario():
+            async with PackingService(1, executor=self.executor) as service:
+                await service.slots.acquire()
+                await service.pack(self.instance, timeout=0.05)
+        with self.assertRaises(asyncio.TimeoutError):
+            run(scenario())
+
+    def test_pack_should_not_send_requests_that_timed_out_waiting_for_a_worker(self):
+        async def scenario():
+            async with PackingService(1, max_delay=0, executor=self.executor) as service:
+                await service.slots.acquire()
+                with self.assertRaises(asyncio.TimeoutError):
+                    await service.pack(self.instance, timeout=0.05)
+                service.slots.release()
+                await asyncio.sleep(0.05)
+                return service.batches, service.slots.locked()
+        self.assertEqual((0, False), run(scenario()))
+
+    def test_pack_should_reject_requests_when_queue_is_full(self):
+        async def scenario():
+            async with PackingService(1, max_pending=1, max_delay=0, executor=self.executor) as service:
+                await service.slots.acquire()
+                first = asyncio.ensure_future(service.pack(self.instance))
+                await asyncio.sleep(0.05)
+                second = asyncio.ensure_future(service.pack(self.instance))
+                await asyncio.sleep(0)
+                try:
+                    await service.pack(self.instance)
+                finally:
+                    service.slots.release()
+                    await asyncio.gather(first, second)
+        with self.assertRaises(ServiceOverloaded):
+            run(scenario())
+
+
+class ServerTest(unittest.TestCase):
+    def test_instance_from_payload_with_invalid_objects_should_raise_valueerror(self):
+        with self.assertRaises(ValueError):
+            instance_from_payload({"capacity": 10, "objects": [4, "a"]})
+        with self.assertRaises(ValueError):
+            instance_from_payload({"capacity": 10})
+
+    def test_server_should_answer_requests_longer_than_limit_with_an_error(self):
+        async def scenario():
+            executor = ThreadPoolExecutor(1)
+            async with PackingService(1, executor=executor) as service:
+                server = await asyncio.start_server(
+                    lambda reader, writer: handle_connection(service, reader, writer), "127.0.0.1", 0,
+                    limit=1024)
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                big = json.dumps({"id": 1, "capacity": 10, "objects": [1] * 5000})
+                writer.write(big.encode() + b'\n{"id": 2, "capacity": 10, "objects": [4, 6]}\n')
+                answers = [json.loads(await reader.readline()) for idx in range(2)]
+                writer.close()
+                report = await run_load("127.0.0.1", port, requests=2, concurrency=1, n_objects=2000,
+                                        limit=1024)
+                server.close()
+                await server.wait_closed()
+            executor.shutdown()
+            return answers, report
+        answers, report = run(scenario())
+        self.assertEqual({"error": "invalid request: too large"}, answers[0])
+        self.assertEqual({"id": 2, "boxes": 1, "assignment": [0, 0]}, answers[1])
+        self.assertEqual(2, report["errors"])
+
+    def test_server_should_answer_requests_and_load_generator_should_report_latency(self):
+        async def scenario():
+            executor = ThreadPoolExecutor(1)
+            async with PackingService(1, executor=executor) as service:
+                server = await asyncio.start_server(
+                    lambda reader, writer: handle_connection(service, reader, writer), "127.0.0.1", 0)
+                port = server.sockets[0].getsockname()[1]
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b'{"id": 7, "capacity": 10, "objects": [4, 6, 5, 5]}\n{"id": 8}\n'
+                             b'{"id": 9, "capacity": 10, "objects": [4], "timeout": "x"}\n'
+                             b'{"id": 10, "capacity": 10, "objects": [4], "algorithm": []}\n')
+                answers = [json.loads(await reader.readline()) for idx in range(4)]
+                writer.close()
+                report = await run_load("127.0.0.1", port, requests=20, concurrency=4, n_objects=50)
+                server.close()
+                await server.wait_closed()
+            executor.shutdown()
+            return answers, report
+        answers, report = run(scenario())
+        answers.sort(key=lambda answer: answer["id"])
+        self.assertEqual({"id": 7, "boxes": 2, "assignment": [0, 0, 1, 1]}, answers[0])
+        self.assertEqual(8, answers[1]["id"])
+        self.assertIn("invalid request", answers[1]["error"])
+        self.assertEqual(9, answers[2]["id"])
+        self.assertIn("invalid request", answers[2]["error"])
+        self.assertIn("invalid request", answers[3]["error"])
+        self.assertEqual(0, report["errors"])
+        self.assertIn("p99_ms", report)